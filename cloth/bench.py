@@ -0,0 +1,237 @@
+"""
+Headless cloth benchmark.
+
+Runs a fixed number of steps per grid size from a seeded, scripted mouse
+trajectory (a drag, a rest, then a tearing sweep) and reports per-phase
+timings and steps/second as a table and as JSON.
+
+    python -m cloth.bench
+    python -m cloth.bench --sizes 50x30 200x120 --steps 300 --json out.json
+    python -m cloth.bench --render          # also time drawing (dummy SDL)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from cloth.scene import Cloth, PRESETS
+
+
+SIZES = ["50x30", "100x60", "200x120", "500x300"]
+
+SPACING = 20
+ORIGIN = (100, 50)
+
+
+def trajectory(steps, cols, rows, seed=0):
+
+    # Scripted input as (mx, my, (left, middle, right)) per step:
+    #   first third  - left-drag random walk over the lower cloth
+    #   second third - no buttons, let the cloth settle
+    #   last third   - right-drag sweep tearing across the middle
+    rng = np.random.default_rng(seed)
+
+    width = (cols - 1) * SPACING
+    height = (rows - 1) * SPACING
+
+    x = ORIGIN[0] + width / 2
+    y = ORIGIN[1] + height * 0.75
+
+    third = steps // 3
+    script = []
+
+    for k in range(steps):
+
+        if k < third:
+            x = float(np.clip(x + rng.normal(0, 15), ORIGIN[0], ORIGIN[0] + width))
+            y = float(np.clip(y + rng.normal(0, 15), ORIGIN[1], ORIGIN[1] + height))
+            script.append((x, y, (True, False, False)))
+
+        elif k < 2 * third:
+            script.append((x, y, (False, False, False)))
+
+        else:
+            t = (k - 2 * third) / max(steps - 2 * third - 1, 1)
+            x = ORIGIN[0] + width * t
+            y = ORIGIN[1] + height / 2 + rng.normal(0, 5)
+            script.append((x, y, (False, False, True)))
+
+    return script
+
+
+def run(cols, rows, steps=200, preset="fun", seed=0, render=False,
+        workers=0, processes=False):
+
+    # The view (and offscreen surface) spans twice the cloth's height, so
+    # pieces torn off fall out of it and get retired
+    view = (
+        0, 0,
+        ORIGIN[0] * 2 + cols * SPACING,
+        ORIGIN[1] * 2 + rows * SPACING * 2
+    )
+
+    cloth = Cloth.grid(
+        cols, rows,
+        preset=preset,
+        origin=ORIGIN,
+        spacing=SPACING,
+        workers=workers,
+        processes=processes,
+        view=view
+    )
+
+    script = trajectory(steps, cols, rows, seed)
+
+    surface = None
+    lines = None
+    draw_time = 0.0
+    draw_calls = 0
+
+    if render:
+        import pygame
+        from cloth.render import Polylines
+
+        lines = Polylines(2)
+        surface = pygame.Surface(view[2:])
+
+    start = time.perf_counter()
+
+    for mx, my, buttons in script:
+
+        cloth.step(mx, my, buttons)
+
+        if surface is not None:
+            t = time.perf_counter()
+            surface.fill((0, 5, 10))
+            lines.draw(surface, cloth.sticks, cloth.points.pos, (0, 255, 150))
+            draw_time += time.perf_counter() - t
+            draw_calls += lines.calls
+
+    total = time.perf_counter() - start
+    cloth.close()
+
+    phases = {
+        name: seconds / steps * 1000
+        for name, seconds in cloth.timings.items()
+    }
+
+    if render:
+        phases["render"] = draw_time / steps * 1000
+
+    result = {
+        "size": "%dx%d" % (cols, rows),
+        "particles": cols * rows,
+        "sticks": len(cloth.sticks.a),
+        "live_sticks": len(cloth.sticks),
+        "retired_particles": int(cloth.topology.retired.sum()),
+        "steps": steps,
+        "passes_per_step": cloth.passes / steps,
+        "final_residual": cloth.sticks.residual,
+        "ms_per_phase": phases,
+        "ms_per_step": total / steps * 1000,
+        "steps_per_second": steps / total,
+    }
+
+    if render:
+        result["draw_calls_per_step"] = draw_calls / steps
+
+    return result
+
+
+def table(results):
+
+    phases = list(results[0]["ms_per_phase"]) if results else []
+
+    head = (
+        ["size", "particles", "live/sticks", "passes"] +
+        phases +
+        ["ms/step", "steps/s"]
+    )
+    rows = []
+
+    for r in results:
+        rows.append(
+            [
+                r["size"],
+                str(r["particles"]),
+                "%d/%d" % (r["live_sticks"], r["sticks"]),
+                "%.1f" % r["passes_per_step"],
+            ] +
+            ["%.3f" % r["ms_per_phase"][p] for p in phases] +
+            ["%.3f" % r["ms_per_step"], "%.1f" % r["steps_per_second"]]
+        )
+
+    widths = [max(len(c) for c in col) for col in zip(head, *rows)]
+
+    lines = ["  ".join(c.rjust(w) for c, w in zip(head, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+
+    for row in rows:
+        lines.append("  ".join(c.rjust(w) for c, w in zip(row, widths)))
+
+    return "\n".join(lines)
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Headless cloth benchmark")
+    parser.add_argument("--sizes", nargs="+", default=SIZES,
+                        help="grid sizes as COLSxROWS")
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="fun")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="coloured solver worker count (0 = batched)")
+    parser.add_argument("--processes", action="store_true",
+                        help="run coloured solver workers as processes")
+    parser.add_argument("--render", action="store_true",
+                        help="also time drawing to an offscreen surface")
+    parser.add_argument("--json", metavar="PATH",
+                        help="write results as JSON ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    if args.render:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    results = []
+
+    for size in args.sizes:
+        cols, rows = (int(v) for v in size.lower().split("x"))
+
+        results.append(run(
+            cols, rows,
+            steps=args.steps,
+            preset=args.preset,
+            seed=args.seed,
+            render=args.render,
+            workers=args.workers,
+            processes=args.processes
+        ))
+
+    report = {
+        "preset": args.preset,
+        "steps": args.steps,
+        "seed": args.seed,
+        "workers": args.workers,
+        "processes": args.processes,
+        "results": results,
+    }
+
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return
+
+    print(table(results))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+import os
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from cloth.sticks import Candidates, Sticks, locate, stretch, tear_hits, tear_mask
+
+
+def colour_sticks(a, b):
+
+    # Greedy edge colouring: no two sticks of one colour share a particle.
+    # On the stick grid (rows, then columns) this gives exactly four
+    # classes: alternate sticks along each row, then along each column.
+    used = {}
+    colour = np.empty(len(a), dtype=np.intp)
+
+    for k, (i, j) in enumerate(zip(a.tolist(), b.tolist())):
+
+        taken = used.get(i, 0) | used.get(j, 0)
+        c = (~taken & (taken + 1)).bit_length() - 1
+
+        colour[k] = c
+        used[i] = used.get(i, 0) | 1 << c
+        used[j] = used.get(j, 0) | 1 << c
+
+    return colour
+
+
+class _Share:
+
+    # One worker's slice of every colour class.  The owner compacts its own
+    # index arrays and flags broken sticks in the shared `active` array.
+
+    def __init__(self, sticks, parts):
+
+        self.a = sticks.a
+        self.b = sticks.b
+        self.rest = sticks.rest
+        self.max_length = sticks.max_length
+        self.tear_radius = sticks.tear_radius
+        self.parts = parts
+
+        self.pos = None
+        self.free = None
+        self.active = None
+
+    def attach(self, pos, free, active):
+
+        self.pos = pos
+        self.free = free
+        self.active = active
+
+    def prune(self):
+
+        # Forget sticks deactivated outside relax (retired fragments)
+        self.parts = [idx[self.active[idx]] for idx in self.parts]
+
+    def relax(self, c, tear, cand=None):
+
+        # Returns (broken, max stretch, sum of squared stretch, sticks)
+        idx = self.parts[c]
+
+        if not len(idx):
+            return 0, 0.0, 0.0, 0
+
+        pos = self.pos
+        ia = self.a[idx]
+        ib = self.b[idx]
+
+        p1 = pos[ia]
+        p2 = pos[ib]
+
+        dx = p2[:, 0] - p1[:, 0]
+        dy = p2[:, 1] - p1[:, 1]
+        d = np.hypot(dx, dy)
+
+        broken = d > self.max_length
+
+        if cand is not None:
+            broken[tear_hits(p1, p2, tear, self.tear_radius, locate(idx, cand))] = True
+        elif tear is not None:
+            broken |= tear_mask(p1, p2, tear, self.tear_radius)
+
+        count = int(broken.sum())
+
+        if count:
+            keep = ~broken
+            self.active[idx[broken]] = False
+            self.parts[c] = idx = idx[keep]
+            ia = ia[keep]
+            ib = ib[keep]
+            dx = dx[keep]
+            dy = dy[keep]
+            d = d[keep]
+
+        rest = self.rest[idx]
+        s = stretch(d, rest)
+
+        f = (rest - d) / np.where(d == 0, 0.1, d) * 0.5
+
+        corr = np.column_stack((dx * f, dy * f))
+
+        # No particle appears twice within a colour, so plain fancy-index
+        # updates are safe here.
+        fa = self.free[ia]
+        fb = self.free[ib]
+
+        pos[ia[fa]] -= corr[fa]
+        pos[ib[fb]] += corr[fb]
+
+        if not len(s):
+            return count, 0.0, 0.0, 0
+
+        return count, float(s.max()), float(np.dot(s, s)), len(s)
+
+
+def _serve(conn, share, names, n, m):
+
+    blocks = [shared_memory.SharedMemory(name) for name in names]
+
+    share.attach(
+        np.ndarray((n, 2), np.float64, blocks[0].buf),
+        np.ndarray((n,), bool, blocks[1].buf),
+        np.ndarray((m,), bool, blocks[2].buf)
+    )
+
+    while True:
+
+        msg = conn.recv()
+
+        if msg is None:
+            break
+
+        cmd, args = msg
+        conn.send(getattr(share, cmd)(*args))
+
+    share.attach(None, None, None)
+
+    for block in blocks:
+        block.close()
+
+
+class ColouredSticks(Sticks):
+
+    # Relaxes one colour class at a time, each class split across a worker
+    # pool.  Within a class every stick touches distinct particles, so the
+    # workers write positions without locking.
+    #
+    # Threads share the arrays directly.  With processes=True the
+    # positions, free mask and active flags are moved into shared memory
+    # and each process keeps its share of the sticks for its lifetime.
+
+    def __init__(self, a, b, rest, n=None, workers=None, processes=False,
+                 **params):
+
+        super().__init__(a, b, rest, n, **params)
+
+        self.colour = colour_sticks(self.a, self.b)
+        self.colours = int(self.colour.max()) + 1 if len(self.colour) else 0
+
+        self.workers = workers or os.cpu_count() or 1
+        self.processes = processes
+
+        self._shares = []
+        self._pool = None
+        self._blocks = []
+        self._conns = []
+        self._procs = []
+
+        for k in range(self.workers):
+            parts = []
+
+            for c in range(self.colours):
+                idx = np.flatnonzero(self.colour == c)
+                parts.append(np.array_split(idx, self.workers)[k])
+
+            self._shares.append(_Share(self, parts))
+
+        self._bound = None
+
+    def bind(self, points):
+
+        if self._bound is points:
+            return
+
+        self.close()
+        self._bound = points
+
+        if not self.processes:
+            for share in self._shares:
+                share.attach(points.pos, points.free, self.active)
+
+            self._pool = ThreadPoolExecutor(self.workers)
+            return
+
+        # Move the shared state into shared memory; the integrator keeps
+        # working on the same (now shared) arrays.
+        n = len(points.pos)
+        m = len(self.a)
+
+        views = []
+
+        for arr in (points.pos, points.free, self.active):
+            block = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+            view = np.ndarray(arr.shape, arr.dtype, block.buf)
+            view[...] = arr
+            self._blocks.append(block)
+            views.append(view)
+
+        points.pos, points.free, self.active = views
+
+        names = [block.name for block in self._blocks]
+
+        for share in self._shares:
+            parent, child = mp.Pipe()
+            proc = mp.Process(
+                target=_serve,
+                args=(child, share, names, n, m),
+                daemon=True
+            )
+            proc.start()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+    def close(self):
+
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+        for conn in self._conns:
+            conn.send(None)
+
+        for proc in self._procs:
+            proc.join()
+
+        if self._blocks and self._bound is not None:
+            # Hand private copies back before the blocks go away
+            points = self._bound
+            points.pos = points.pos.copy()
+            points.free = points.free.copy()
+            self.active = self.active.copy()
+
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+
+        self._blocks = []
+        self._conns = []
+        self._procs = []
+        self._bound = None
+
+    def relax(self, points, iterations=6, tear=None, grid=None,
+              tolerance=None, min_iterations=1):
+
+        # Each class is measured as it is relaxed, so the residual of a
+        # pass is taken across the pass rather than before it; the early
+        # stop is checked after the pass.
+        self.bind(points)
+
+        cand = None
+
+        if tear is not None and grid is not None:
+            cand = Candidates(self, points, tear, grid)
+
+        broken = 0
+        self.iterations = 0
+
+        for _ in range(iterations):
+
+            peak = total = 0.0
+            count = 0
+
+            for c in range(self.colours):
+                ids = None if cand is None else cand.current()
+                top = 0.0
+
+                for b, m, sq, k in self._run(c, tear, ids):
+                    broken += b
+                    top = max(top, m)
+                    total += sq
+                    count += k
+
+                # Within a class each particle takes one correction of
+                # |rest - d| / 2
+                if cand is not None:
+                    cand.advance(top * self.max_rest / 2)
+
+                peak = max(peak, top)
+
+            self.iterations += 1
+
+            if self.norm == "rms":
+                self.residual = (total / count) ** 0.5 if count else 0.0
+            else:
+                self.residual = peak
+
+            if (
+                tolerance is not None and
+                self.iterations >= min_iterations and
+                self.residual <= tolerance
+            ):
+                break
+
+        if broken:
+            self._compact(np.flatnonzero(self.active))
+
+    def retire(self, dead):
+
+        live = len(self.live)
+        super().retire(dead)
+
+        if len(self.live) != live:
+            self._call("prune")
+
+    def _run(self, c, tear, cand):
+        return self._call("relax", c, tear, cand)
+
+    def _call(self, cmd, *args):
+
+        if self._conns:
+            for conn in self._conns:
+                conn.send((cmd, args))
+
+            return [conn.recv() for conn in self._conns]
+
+        return list(self._pool.map(
+            lambda share: getattr(share, cmd)(*args),
+            self._shares
+        ))
@@ -0,0 +1,313 @@
+"""
+Binary recording and memory-mapped replay of cloth runs.
+
+File layout (little-endian):
+
+    header   magic "CLTH", version, particles n, sticks m, header size
+    topology a (int64, m), b (int64, m), pinned (uint8, n), zero padded
+    records  one fixed-width record per step:
+               step (uint64), mouse (2 x float64), buttons (uint8 bits),
+               positions (n x 2 float64), active sticks (bit-packed)
+
+    python -m cloth.record play run.clth            # step / seek in a window
+    python -m cloth.record render run.clth --json - # headless draw timing
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+
+MAGIC = b"CLTH"
+VERSION = 1
+
+_HEAD = struct.Struct("<4sIQQQ")
+
+
+def record_dtype(n, m):
+
+    return np.dtype([
+        ("step", "<u8"),
+        ("mouse", "<f8", (2,)),
+        ("buttons", "u1"),
+        ("pad", "u1", (7,)),
+        ("pos", "<f8", (n, 2)),
+        ("active", "u1", ((m + 7) // 8,)),
+    ])
+
+
+def _header_size(n, m):
+
+    size = _HEAD.size + 16 * m + n
+    return (size + 7) // 8 * 8
+
+
+class Recorder:
+
+    # Appends one record per step, flushed as written, so the file is
+    # replayable while open.
+
+    def __init__(self, path, cloth):
+
+        points = cloth.points
+        sticks = cloth.sticks
+
+        self.n = len(points.pos)
+        self.m = len(sticks.a)
+        self.dtype = record_dtype(self.n, self.m)
+        self.steps = 0
+
+        size = _header_size(self.n, self.m)
+
+        self.f = open(path, "wb")
+        self.f.write(_HEAD.pack(MAGIC, VERSION, self.n, self.m, size))
+        self.f.write(sticks.a.astype("<i8").tobytes())
+        self.f.write(sticks.b.astype("<i8").tobytes())
+        self.f.write(points.pinned.astype("u1").tobytes())
+        self.f.write(b"\0" * (size - self.f.tell()))
+        self.f.flush()
+
+        self._rec = np.zeros(1, dtype=self.dtype)
+
+    def write(self, cloth, mx=0, my=0, buttons=(False, False, False)):
+
+        rec = self._rec[0]
+
+        rec["step"] = self.steps
+        rec["mouse"] = (mx, my)
+        rec["buttons"] = sum(1 << i for i, b in enumerate(buttons[:3]) if b)
+        rec["pos"] = cloth.points.pos
+        rec["active"] = np.packbits(cloth.sticks.active)
+
+        self.f.write(self._rec.tobytes())
+        self.f.flush()
+        self.steps += 1
+
+    def close(self):
+        self.f.close()
+
+
+class Frame:
+
+    # One replayed step; looks enough like Sticks for segments() and
+    # Polylines (la, lb, live).
+
+    def __init__(self, replay, rec):
+
+        self.step = int(rec["step"])
+        self.mouse = tuple(rec["mouse"].tolist())
+        self.buttons = tuple(bool(rec["buttons"] >> i & 1) for i in range(3))
+
+        self.pos = rec["pos"]
+        self.active = np.unpackbits(rec["active"], count=replay.m).astype(bool)
+
+        self.live = np.flatnonzero(self.active)
+        self.la = replay.a[self.live]
+        self.lb = replay.b[self.live]
+
+    def __len__(self):
+        return len(self.live)
+
+    def segments(self, pos=None):
+
+        pos = self.pos if pos is None else pos
+        return pos[self.la], pos[self.lb]
+
+
+class Replay:
+
+    # Memory-maps a recording; frames are read on demand, so seeking to
+    # any step costs one record regardless of file length.
+
+    def __init__(self, path):
+
+        with open(path, "rb") as f:
+            magic, version, n, m, size = _HEAD.unpack(f.read(_HEAD.size))
+
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("Not a cloth recording: %s" % path)
+
+            self.n = n
+            self.m = m
+            self.a = np.fromfile(f, "<i8", m).astype(np.intp)
+            self.b = np.fromfile(f, "<i8", m).astype(np.intp)
+            self.pinned = np.fromfile(f, "u1", n).astype(bool)
+
+        self.dtype = record_dtype(n, m)
+
+        count = (os.path.getsize(path) - size) // self.dtype.itemsize
+
+        self.records = np.memmap(
+            path, dtype=self.dtype, mode="r", offset=size, shape=(count,)
+        ) if count else np.zeros(0, dtype=self.dtype)
+
+    def __len__(self):
+        return len(self.records)
+
+    def frame(self, k):
+        return Frame(self, self.records[k])
+
+    def __iter__(self):
+        for k in range(len(self)):
+            yield self.frame(k)
+
+
+def render(path, colour=(0, 255, 150), width=2):
+
+    # Re-draw every frame to an offscreen surface, timing drawing alone
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    import pygame
+    from cloth.render import Polylines
+
+    replay = Replay(path)
+
+    if not len(replay):
+        return {"frames": 0}
+
+    # Sized from the first frame only (at least the player's window), so
+    # no pages are read ahead of playback; later frames drawn beyond it
+    # are clipped, as on screen
+    pos = replay.records[0]["pos"]
+    w = max(int(pos[:, 0].max()) + 1, 1280)
+    h = max(int(pos[:, 1].max()) + 1, 800)
+
+    surface = pygame.Surface((min(w, 16384), min(h, 16384)))
+    lines = Polylines(width)
+
+    load = draw = 0.0
+    calls = 0
+
+    for k in range(len(replay)):
+
+        t0 = time.perf_counter()
+        frame = replay.frame(k)
+        t1 = time.perf_counter()
+
+        surface.fill((0, 5, 10))
+        lines.draw(surface, frame, frame.pos, colour)
+
+        t2 = time.perf_counter()
+
+        load += t1 - t0
+        draw += t2 - t1
+        calls += lines.calls
+
+    frames = len(replay)
+
+    return {
+        "frames": frames,
+        "particles": replay.n,
+        "sticks": replay.m,
+        "ms_load_per_frame": load / frames * 1000,
+        "ms_draw_per_frame": draw / frames * 1000,
+        "draw_calls_per_frame": calls / frames,
+    }
+
+
+def play(path):
+
+    # Arrow keys step, Page Up / Down jump 60 steps, Home / End seek,
+    # space plays and pauses, Esc quits.
+    import pygame
+    from cloth.render import Polylines
+
+    replay = Replay(path)
+
+    if not len(replay):
+        return
+
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 800), pygame.RESIZABLE)
+    clock = pygame.time.Clock()
+    lines = Polylines(2)
+
+    k = 0
+    playing = False
+    last = len(replay) - 1
+
+    running = True
+    while running:
+
+        for e in pygame.event.get():
+            if e.type == pygame.QUIT:
+                running = False
+
+            if e.type == pygame.KEYDOWN:
+                keys = {
+                    pygame.K_RIGHT: 1, pygame.K_LEFT: -1,
+                    pygame.K_PAGEDOWN: 60, pygame.K_PAGEUP: -60,
+                }
+
+                if e.key == pygame.K_ESCAPE:
+                    running = False
+                elif e.key == pygame.K_SPACE:
+                    playing = not playing
+                elif e.key == pygame.K_HOME:
+                    k = 0
+                elif e.key == pygame.K_END:
+                    k = last
+                elif e.key in keys:
+                    k = max(0, min(last, k + keys[e.key]))
+
+        if playing:
+            k = min(last, k + 1)
+
+        frame = replay.frame(k)
+
+        screen.fill((0, 5, 10))
+        lines.draw(screen, frame, frame.pos, (0, 255, 150))
+
+        mx, my = frame.mouse
+        pygame.draw.circle(screen, (255, 80, 80), (mx, my), 4, 1)
+        pygame.display.set_caption(
+            "step %d / %d  sticks %d" % (frame.step, last, len(frame))
+        )
+
+        pygame.display.flip()
+        clock.tick(60)
+
+    pygame.quit()
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Cloth recording tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("play", help="step through a recording in a window")
+    p.add_argument("path")
+
+    p = sub.add_parser("render", help="time headless re-rendering")
+    p.add_argument("path")
+    p.add_argument("--json", metavar="PATH",
+                   help="write results as JSON ('-' for stdout)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "play":
+        play(args.path)
+        return
+
+    result = render(args.path)
+
+    if args.json == "-":
+        json.dump(result, sys.stdout, indent=2)
+        print()
+        return
+
+    for key, value in result.items():
+        print("%-22s %s" % (key, value))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
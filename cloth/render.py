@@ -0,0 +1,90 @@
+import numpy as np
+import pygame
+
+
+def hue_table(bins=72):
+
+    # Full-saturation colours for `bins` evenly spaced hues
+    table = []
+
+    for i in range(bins):
+        c = pygame.Color(0)
+        c.hsva = (i * 360 / bins, 100, 100, 100)
+        table.append(c)
+
+    return table
+
+
+class Polylines:
+
+    # Draws sticks as polylines, one draw call per unbroken run.
+    #
+    # Consecutive live sticks form a run when one ends where the next
+    # starts (Sticks.grid orders rows and then columns that way), so the
+    # draw-call count follows the number of unbroken segments rather than
+    # the number of sticks.  Runs are recomputed only after sticks break.
+
+    def __init__(self, width=2):
+
+        self.width = width
+        self.calls = 0
+
+        self._live = None
+        self._starts = None
+
+    def _runs(self, sticks):
+
+        if self._live is not sticks.live:
+            la = sticks.la
+            lb = sticks.lb
+
+            split = np.ones(len(la), dtype=bool)
+            split[1:] = lb[:-1] != la[1:]
+
+            self._live = sticks.live
+            self._starts = np.flatnonzero(split)
+
+        return self._starts
+
+    def _vertices(self, sticks, pos, starts):
+
+        # Vertex list per run: the first stick's start, then every end
+        verts = np.insert(sticks.lb, starts, sticks.la[starts])
+        bounds = np.append(starts + np.arange(len(starts)), len(verts))
+
+        return pos[verts].tolist(), bounds.tolist()
+
+    def draw(self, surface, sticks, pos, colour):
+
+        starts = self._runs(sticks)
+        pts, bounds = self._vertices(sticks, pos, starts)
+
+        for i, j in zip(bounds, bounds[1:]):
+            pygame.draw.lines(surface, colour, False, pts[i:j], self.width)
+
+        self.calls = len(starts)
+
+    def draw_hue(self, surface, sticks, pos, ticks, table):
+
+        # Hue follows the start x of each stick and time, quantized to the
+        # table's bins; runs are split wherever the bin changes.
+        starts = self._runs(sticks)
+
+        if not len(starts):
+            self.calls = 0
+            return
+
+        hue = (pos[sticks.la, 0] * 0.1 + ticks * 0.1) % 360
+        bins = (hue * (len(table) / 360)).astype(np.intp) % len(table)
+
+        split = np.zeros(len(bins), dtype=bool)
+        split[starts] = True
+        split[1:] |= bins[1:] != bins[:-1]
+        starts = np.flatnonzero(split)
+
+        pts, bounds = self._vertices(sticks, pos, starts)
+
+        for k, i, j in zip(bins[starts].tolist(), bounds, bounds[1:]):
+            pygame.draw.lines(surface, table[k], False, pts[i:j], self.width)
+
+        self.calls = len(starts)
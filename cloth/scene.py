@@ -0,0 +1,153 @@
+import time
+
+import numpy as np
+
+from cloth.parallel import ColouredSticks
+from cloth.spatial import SpatialGrid
+from cloth.sticks import Sticks
+from cloth.topology import Topology
+from cloth.verlet import Verlet
+
+
+# Tuning of the two demos, per 60 Hz step.  Relaxation stops once the rms
+# stretch falls to `tolerance`, between `min_iterations` and `iterations`
+# passes.
+PRESETS = {
+    "fun": {
+        "points": dict(damping=0.99, max_speed=20, gravity=0.4, drag_radius=30),
+        "sticks": dict(max_length=100, tear_radius=15, norm="rms"),
+        "iterations": 16,
+        "min_iterations": 2,
+        "tolerance": 0.1,
+    },
+    "fun1": {
+        "points": dict(damping=0.98, gravity=0.5, drag_radius=35),
+        "sticks": dict(max_length=70, tear_radius=20, norm="rms"),
+        "iterations": 14,
+        "min_iterations": 2,
+        "tolerance": 0.1,
+    },
+}
+
+
+class Cloth:
+
+    # One simulation step: grid upkeep, integration, then relaxation.
+    # Keeps the positions from before the last step so a renderer can
+    # interpolate between the two most recent states, and accumulates
+    # wall time per phase in `timings` and relaxation passes in `passes`.
+    # Given a `view` rectangle (x0, y0, x1, y1), fragments torn loose and
+    # fallen out of it are retired (see Topology).
+
+    def __init__(self, points, sticks, iterations=6, index=None,
+                 tolerance=None, min_iterations=1, view=None):
+
+        self.points = points
+        self.sticks = sticks
+        self.iterations = iterations
+        self.tolerance = tolerance
+        self.min_iterations = min_iterations
+        # Spatial index over the particles, for drag and tear queries
+        self.index = index if index is not None else SpatialGrid()
+
+        self.topology = None
+
+        if view is not None:
+            self.topology = Topology(points, sticks, view)
+
+        self.prev = points.pos.copy()
+
+        self.steps = 0
+        self.passes = 0
+        self.timings = {
+            "grid": 0.0,
+            "integrate": 0.0,
+            "relax": 0.0,
+            "topology": 0.0,
+        }
+
+    @classmethod
+    def grid(cls, cols, rows, preset="fun", origin=(0, 0), old_origin=None,
+             spacing=20, workers=0, processes=False, view=None):
+
+        # workers > 0 relaxes colour classes across that many threads
+        # (or processes over shared memory)
+        config = PRESETS[preset]
+
+        points = Verlet.grid(
+            cols, rows,
+            spacing=spacing,
+            origin=origin,
+            old_origin=old_origin,
+            **config["points"]
+        )
+
+        if workers:
+            sticks = ColouredSticks.grid(
+                cols, rows,
+                spacing=spacing,
+                workers=workers,
+                processes=processes,
+                **config["sticks"]
+            )
+        else:
+            sticks = Sticks.grid(cols, rows, spacing=spacing, **config["sticks"])
+
+        return cls(
+            points,
+            sticks,
+            config["iterations"],
+            tolerance=config["tolerance"],
+            min_iterations=config["min_iterations"],
+            view=view
+        )
+
+    def step(self, mx=0, my=0, buttons=(False, False, False)):
+
+        points = self.points
+        timings = self.timings
+
+        np.copyto(self.prev, points.pos)
+
+        t0 = time.perf_counter()
+
+        self.index.update(points.pos)
+
+        t1 = time.perf_counter()
+
+        # Left mouse drags, right mouse tears
+        points.step(mx, my, buttons[0], self.index)
+
+        t2 = time.perf_counter()
+
+        self.sticks.relax(
+            points,
+            self.iterations,
+            (mx, my) if buttons[2] else None,
+            self.index,
+            self.tolerance,
+            self.min_iterations
+        )
+
+        t3 = time.perf_counter()
+
+        if self.topology is not None:
+            self.topology.update(points, self.sticks)
+
+        t4 = time.perf_counter()
+
+        timings["grid"] += t1 - t0
+        timings["integrate"] += t2 - t1
+        timings["relax"] += t3 - t2
+        timings["topology"] += t4 - t3
+        self.steps += 1
+        self.passes += self.sticks.iterations
+
+    def lerp(self, alpha):
+
+        # Positions `alpha` of the way from the previous step to the last
+        prev = self.prev
+        return prev + (self.points.pos - prev) * alpha
+
+    def close(self):
+        self.sticks.close()
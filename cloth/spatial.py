@@ -0,0 +1,97 @@
+import numpy as np
+
+
+# Cell coordinates are biased into 31 bits and packed column-major, so the
+# cells of one grid column form a single contiguous key range.
+_BIAS = 1 << 30
+
+
+def _pack(cx, cy):
+    return (cx + _BIAS) << 32 | (cy + _BIAS)
+
+
+class SpatialGrid:
+
+    # Uniform bucket grid over particle positions.
+    #
+    # Particles are kept sorted by cell key.  `update` only reinserts the
+    # particles whose cell changed since the last call, so a cloth at
+    # rest costs one key comparison per particle.
+
+    def __init__(self, cell=40):
+
+        self.cell = float(cell)
+
+        self.keys = None    # (n,) cell key per particle
+        self.order = None   # particle indices sorted by key
+        self.sorted = None  # keys[order]
+
+    def _keys(self, pos):
+
+        c = np.floor(pos / self.cell).astype(np.int64)
+        return _pack(c[:, 0], c[:, 1])
+
+    def update(self, pos):
+
+        keys = self._keys(pos)
+
+        if self.keys is None or len(keys) != len(self.keys):
+            self.keys = keys
+            self.order = np.argsort(keys, kind="stable")
+            self.sorted = keys[self.order]
+            return len(keys)
+
+        moved = keys != self.keys
+        count = int(moved.sum())
+
+        if not count:
+            return 0
+
+        if count > len(keys) // 4:
+            # Reinsertion stops paying off once much of the cloth moves
+            self.keys = keys
+            self.order = np.argsort(keys, kind="stable")
+            self.sorted = keys[self.order]
+            return count
+
+        # Drop the movers, then merge them back in at their new keys
+        stay = ~moved[self.order]
+        order = self.order[stay]
+        sorted_keys = self.sorted[stay]
+
+        idx = np.flatnonzero(moved)
+        new = keys[idx]
+        by_key = np.argsort(new, kind="stable")
+        idx = idx[by_key]
+        new = new[by_key]
+
+        at = np.searchsorted(sorted_keys, new)
+
+        self.keys = keys
+        self.order = np.insert(order, at, idx)
+        self.sorted = np.insert(sorted_keys, at, new)
+
+        return count
+
+    def candidates(self, x, y, r):
+
+        # Particles in every cell touched by the square around (x, y)
+        cx0, cx1 = int(np.floor((x - r) / self.cell)), int(np.floor((x + r) / self.cell))
+        cy0, cy1 = int(np.floor((y - r) / self.cell)), int(np.floor((y + r) / self.cell))
+
+        cols = np.arange(cx0, cx1 + 1, dtype=np.int64)
+
+        lo = np.searchsorted(self.sorted, _pack(cols, cy0), "left")
+        hi = np.searchsorted(self.sorted, _pack(cols, cy1), "right")
+
+        return np.concatenate(
+            [self.order[i:j] for i, j in zip(lo.tolist(), hi.tolist())]
+        )
+
+    def query(self, pos, x, y, r):
+
+        # Particles strictly within r of (x, y)
+        idx = self.candidates(x, y, r)
+        p = pos[idx]
+
+        return idx[np.hypot(p[:, 0] - x, p[:, 1] - y) < r]
@@ -0,0 +1,287 @@
+import numpy as np
+
+
+def locate(idx, ids):
+
+    # Positions in the sorted index array `idx` of those `ids` it holds
+    at = np.searchsorted(idx, ids)
+    ok = at < len(idx)
+    at = at[ok]
+
+    return at[idx[at] == ids[ok]]
+
+
+def stretch(d, rest):
+
+    # Relative length error of each stick
+    return np.abs(d - rest) / rest
+
+
+def tear_mask(p1, p2, tear, radius):
+
+    # Sticks whose midpoint lies within `radius` of the cursor
+    mx, my = tear
+
+    return np.hypot(
+        (p1[:, 0] + p2[:, 0]) / 2 - mx,
+        (p1[:, 1] + p2[:, 1]) / 2 - my
+    ) < radius
+
+
+def tear_hits(p1, p2, tear, radius, at):
+
+    # As tear_mask, testing only positions `at` (candidates from a spatial
+    # grid); returns those that are hit
+    q1 = p1[at]
+    q2 = p2[at]
+
+    return at[tear_mask(q1, q2, tear, radius)]
+
+
+class Candidates:
+
+    # Tear candidates from a spatial grid keyed at the start of the step.
+    # `moved` bounds how far any particle has gone since the keying (the
+    # integrator's bound, plus each relaxation pass's), `spent` how far
+    # since the candidates were taken.  They are exact while `spent` is
+    # within the one cell of slack in Sticks.near; past that they are
+    # taken again from the same keys, over a disk widened by `moved`.
+
+    def __init__(self, sticks, points, tear, grid):
+
+        self.sticks = sticks
+        self.points = points
+        self.tear = tear
+        self.grid = grid
+
+        self.moved = points.max_move()
+        self._take()
+
+    def _take(self):
+
+        self.ids = self.sticks.near(self.points, self.tear, self.grid, self.moved)
+        self.spent = 0.0
+
+    def advance(self, step):
+
+        # Every particle has moved at most `step` further
+        self.moved += step
+        self.spent += step
+
+    def current(self):
+
+        if self.spent > self.grid.cell:
+            self._take()
+
+        return self.ids
+
+
+class Sticks:
+
+    # Distance constraints as parallel arrays:
+    #   a, b   (m,) particle indices
+    #   rest   (m,) rest length
+    #   active (m,) stick not broken
+    #
+    # `live` holds the indices of active sticks and is only compacted
+    # when a stick breaks, so relaxation never rescans the broken ones.
+    #
+    # A pass relaxes every live stick at once (Jacobi), so corrections
+    # that land on one particle are summed and then scaled by 2 / degree;
+    # plain summing overshoots on interior particles and tears the cloth
+    # under drag.
+
+    def __init__(self, a, b, rest, n=None, max_length=100, tear_radius=15,
+                 norm="max"):
+
+        self.a = np.ascontiguousarray(a, dtype=np.intp)
+        self.b = np.ascontiguousarray(b, dtype=np.intp)
+        self.rest = np.ascontiguousarray(rest, dtype=np.float64)
+        self.max_rest = float(self.rest.max()) if len(self.rest) else 0.0
+        self.active = np.ones(len(self.a), dtype=bool)
+
+        if n is None:
+            n = int(max(self.a.max(), self.b.max())) + 1 if len(self.a) else 0
+
+        self.n = n
+
+        self.max_length = max_length
+        self.tear_radius = tear_radius
+
+        # Monitoring for the last relax(): passes applied and the stretch
+        # residual ("max" or "rms" relative length error) going into the
+        # last pass
+        self.norm = norm
+        self.iterations = 0
+        self.residual = 0.0
+
+        # Particle -> incident sticks, for grid-driven tear queries
+        ends = np.concatenate((self.a, self.b))
+        by_end = np.argsort(ends, kind="stable")
+        self._incident = by_end % len(self.a) if len(self.a) else by_end
+        self._indptr = np.searchsorted(ends[by_end], np.arange(self.n + 1))
+
+        self._compact(np.arange(len(self.a)))
+
+    @classmethod
+    def grid(cls, cols, rows, spacing=20, **params):
+
+        # Horizontal (i, i+1) row by row, then vertical (i, i+cols) column
+        # by column, so each row and column is a chain of sticks
+        idx = np.arange(cols * rows)
+
+        h = idx[(idx + 1) % cols != 0]
+        v = idx.reshape(rows, cols)[:-1].T.ravel()
+
+        a = np.concatenate((h, v))
+        b = np.concatenate((h + 1, v + cols))
+        rest = np.full(len(a), float(spacing))
+
+        return cls(a, b, rest, cols * rows, **params)
+
+    def __len__(self):
+        return len(self.live)
+
+    def _compact(self, live):
+
+        self.live = live
+        self.la = self.a[live]
+        self.lb = self.b[live]
+        self.lrest = self.rest[live]
+
+        degree = (
+            np.bincount(self.la, minlength=self.n) +
+            np.bincount(self.lb, minlength=self.n)
+        )
+        self.weight = 2.0 / np.maximum(degree, 2)
+
+    def break_sticks(self, broken):
+
+        # `broken` is a mask over the live set
+        self.active[self.live[broken]] = False
+        self._compact(self.live[~broken])
+
+    def retire(self, dead):
+
+        # Drop every live stick touching a retired particle
+        gone = dead[self.la] | dead[self.lb]
+
+        if gone.any():
+            self.break_sticks(gone)
+
+    def near(self, points, tear, grid, moved=0.0):
+
+        # Active sticks that could be cut: those touching a particle within
+        # reach of the cursor.  A midpoint within tear_radius means an
+        # endpoint within tear_radius + length / 2; one extra cell covers
+        # movement until the candidates are taken again (see Candidates).
+        # The grid may be keyed to positions up to `moved` away from the
+        # current ones.
+        mx, my = tear
+        r = self.tear_radius + self.max_length / 2 + grid.cell
+
+        idx = grid.candidates(mx, my, r + moved)
+        p = points.pos[idx]
+        parts = idx[np.hypot(p[:, 0] - mx, p[:, 1] - my) < r]
+
+        ids = np.concatenate([
+            self._incident[self._indptr[i]:self._indptr[i + 1]]
+            for i in parts.tolist()
+        ] or [np.empty(0, dtype=np.intp)])
+
+        ids = np.unique(ids)
+        return ids[self.active[ids]]
+
+    def _residual(self, s):
+
+        if not len(s):
+            return 0.0
+
+        if self.norm == "rms":
+            return float(np.sqrt(np.mean(s * s)))
+
+        return float(s.max())
+
+    def relax(self, points, iterations=6, tear=None, grid=None,
+              tolerance=None, min_iterations=1):
+
+        # Runs up to `iterations` passes.  With a tolerance, stops early
+        # once the residual measured at the start of a pass is within it
+        # (after at least `min_iterations` passes).
+        pos = points.pos
+        free = points.free
+        n = self.n
+
+        cand = None
+
+        if tear is not None and grid is not None:
+            cand = Candidates(self, points, tear, grid)
+
+        self.iterations = 0
+
+        for k in range(iterations):
+
+            if not len(self.live):
+                break
+
+            p1 = pos[self.la]
+            p2 = pos[self.lb]
+
+            dx = p2[:, 0] - p1[:, 0]
+            dy = p2[:, 1] - p1[:, 1]
+            d = np.hypot(dx, dy)
+
+            # Break sticks that are overstretched or cut by the cursor
+            broken = d > self.max_length
+
+            if cand is not None:
+                at = locate(self.live, cand.current())
+                broken[tear_hits(p1, p2, tear, self.tear_radius, at)] = True
+            elif tear is not None:
+                broken |= tear_mask(p1, p2, tear, self.tear_radius)
+
+            if broken.any():
+                keep = ~broken
+                self.break_sticks(broken)
+                dx = dx[keep]
+                dy = dy[keep]
+                d = d[keep]
+
+            st = stretch(d, self.lrest)
+            self.residual = self._residual(st)
+
+            if (
+                tolerance is not None and
+                k >= min_iterations and
+                self.residual <= tolerance
+            ):
+                break
+
+            f = (self.lrest - d) / np.where(d == 0, 0.1, d) * 0.5
+
+            cx = dx * f
+            cy = dy * f
+
+            sx = np.bincount(self.lb, cx, n) - np.bincount(self.la, cx, n)
+            sy = np.bincount(self.lb, cy, n) - np.bincount(self.la, cy, n)
+
+            sx *= self.weight
+            sy *= self.weight
+
+            pos[free, 0] += sx[free]
+            pos[free, 1] += sy[free]
+
+            # A particle's correction is at most twice the mean of its
+            # sticks' |rest - d| / 2, so no more than the largest |rest - d|
+            if cand is not None and len(st):
+                cand.advance(float(st.max()) * self.max_rest)
+
+            self.iterations += 1
+
+    def close(self):
+        pass
+
+    def segments(self, pos):
+
+        # Endpoints of every active stick, for drawing
+        return pos[self.la], pos[self.lb]
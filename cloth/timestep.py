@@ -0,0 +1,36 @@
+class FixedStep:
+
+    # Fixed-rate physics scheduler.
+    #
+    # Feed it the wall time of each rendered frame; it returns how many
+    # physics steps to run and leaves `alpha`, the fraction of a step that
+    # has elapsed since the last one, for interpolating the drawing.
+    # At most `max_substeps` run per frame: any further backlog is dropped
+    # so a slow frame slows the simulation instead of snowballing.
+
+    def __init__(self, rate=60, max_substeps=5):
+
+        self.rate = rate
+        self.dt = 1.0 / rate
+        self.max_substeps = max_substeps
+
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.dropped = 0
+
+    def advance(self, elapsed):
+
+        self.accumulator += elapsed
+
+        steps = int(self.accumulator / self.dt)
+
+        if steps > self.max_substeps:
+            self.dropped += steps - self.max_substeps
+            steps = self.max_substeps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.dt
+
+        self.alpha = self.accumulator / self.dt
+
+        return steps
@@ -0,0 +1,139 @@
+import numpy as np
+
+
+def components(label, ea, eb):
+
+    # Vectorized union-find.  `label` holds a parent pointer per particle
+    # (each particle in the affected set pointing at itself); every edge
+    # (ea, eb) hooks the larger root under the smaller, then pointer
+    # jumping flattens the trees.  On return each particle is labelled
+    # with the smallest particle index in its component.
+    while True:
+
+        ra = label[ea]
+        rb = label[eb]
+
+        diff = ra != rb
+
+        if not diff.any():
+            return label
+
+        ra = ra[diff]
+        rb = rb[diff]
+
+        np.minimum.at(label, np.maximum(ra, rb), np.minimum(ra, rb))
+
+        while True:
+            jumped = label[label]
+
+            if np.array_equal(jumped, label):
+                break
+
+            label = jumped
+
+
+class Topology:
+
+    # Connectivity of the cloth, kept up to date as sticks break.
+    #
+    # Components are labelled by their smallest particle index.  When
+    # sticks break, only the components that lost sticks are relabelled,
+    # at most once every `interval` steps.  A component with no pinned
+    # particle is floating; once every particle of a floating component is
+    # outside `view` (x0, y0, x1, y1) it is retired: its particles stop
+    # integrating and its sticks stop being relaxed and drawn.
+
+    def __init__(self, points, sticks, view, interval=10):
+
+        self.view = view
+        self.interval = interval
+
+        self.n = len(points.pos)
+        self.pinned = np.flatnonzero(points.pinned)
+        self.retired = np.zeros(self.n, dtype=bool)
+
+        self.label = components(np.arange(self.n), sticks.la, sticks.lb)
+        self._active = sticks.active.copy()
+        self._live = len(sticks)
+        self._pending = False
+        self._wait = 0
+
+        self._classify()
+
+    def _classify(self):
+
+        anchored = np.zeros(self.n, dtype=bool)
+        anchored[self.label[self.pinned]] = True
+
+        self.floating = np.flatnonzero(~anchored[self.label] & ~self.retired)
+
+    def relabel(self, sticks):
+
+        # Components that lost a stick since the last relabel
+        broken = np.flatnonzero(self._active & ~sticks.active)
+        self._active = sticks.active.copy()
+        self._pending = False
+        self._wait = 0
+
+        if not len(broken):
+            return
+
+        hit = np.zeros(self.n, dtype=bool)
+        hit[self.label[sticks.a[broken]]] = True
+
+        affected = hit[self.label]
+
+        label = self.label.copy()
+        label[affected] = np.flatnonzero(affected)
+
+        keep = affected[sticks.la]
+        self.label = components(label, sticks.la[keep], sticks.lb[keep])
+
+        self._classify()
+
+    def update(self, points, sticks):
+
+        if len(sticks) != self._live:
+            self._live = len(sticks)
+            self._pending = True
+
+        if self._pending:
+            self._wait += 1
+
+            if self._wait >= self.interval:
+                self.relabel(sticks)
+
+        if not len(self.floating):
+            return 0
+
+        # Retire floating components with no particle left in view
+        x0, y0, x1, y1 = self.view
+        p = points.pos[self.floating]
+
+        inside = (
+            (p[:, 0] >= x0) & (p[:, 0] <= x1) &
+            (p[:, 1] >= y0) & (p[:, 1] <= y1)
+        )
+
+        labels = self.label[self.floating]
+        seen = np.bincount(labels, inside, self.n)
+
+        gone = (seen[labels] == 0)
+
+        if not gone.any():
+            return 0
+
+        dead = self.floating[gone]
+
+        self.retired[dead] = True
+        self.floating = self.floating[~gone]
+
+        # In place, so arrays shared with solver workers stay shared
+        points.free[dead] = False
+        sticks.retire(self.retired)
+
+        # Retired sticks are not breaks; keep them out of the next relabel
+        self._active &= ~self.retired[sticks.a]
+        self._live = len(sticks)
+
+        return len(dead)
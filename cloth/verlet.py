@@ -0,0 +1,101 @@
+import numpy as np
+
+
+class Verlet:
+
+    # Particle state as contiguous arrays:
+    #   pos    (n, 2) current x, y
+    #   old    (n, 2) previous x, y
+    #   pinned (n,)   particle never moves
+
+    def __init__(self, pos, old, pinned,
+                 damping=0.99, max_speed=None, gravity=0.4, drag_radius=30):
+
+        self.pos = np.ascontiguousarray(pos, dtype=np.float64)
+        self.old = np.ascontiguousarray(old, dtype=np.float64)
+        self.pinned = np.ascontiguousarray(pinned, dtype=bool)
+
+        self.damping = damping
+        self.max_speed = max_speed
+        self.gravity = gravity
+        self.drag_radius = drag_radius
+
+        self.free = ~self.pinned
+
+        # Last step's drag and velocities, for max_move
+        self._dragged = False
+        self._vel = None
+
+    @classmethod
+    def grid(cls, cols, rows, spacing=20, origin=(0, 0), old_origin=None,
+             **params):
+
+        # Same layout as the demos: row-major, top row pinned
+        if old_origin is None:
+            old_origin = origin
+
+        gx, gy = np.meshgrid(
+            np.arange(cols) * float(spacing),
+            np.arange(rows) * float(spacing)
+        )
+        gx = gx.ravel()
+        gy = gy.ravel()
+
+        pos = np.column_stack((gx + origin[0], gy + origin[1]))
+        old = np.column_stack((gx + old_origin[0], gy + old_origin[1]))
+        pinned = np.arange(cols * rows) < cols
+
+        return cls(pos, old, pinned, **params)
+
+    def __len__(self):
+        return len(self.pos)
+
+    def drag(self, mx, my, grid=None):
+
+        # Snap every free particle near the cursor onto it; with a spatial
+        # grid only the cells around the cursor are tested.
+        if grid is not None:
+            near = grid.query(self.pos, mx, my, self.drag_radius)
+            near = near[self.free[near]]
+        else:
+            d = np.hypot(self.pos[:, 0] - mx, self.pos[:, 1] - my)
+            near = self.free & (d < self.drag_radius)
+
+        self.pos[near] = (mx, my)
+
+    def step(self, mx=0, my=0, dragging=False, grid=None):
+
+        if dragging:
+            self.drag(mx, my, grid)
+
+        free = self.free
+        pos = self.pos
+
+        vel = (pos[free] - self.old[free]) * self.damping
+
+        if self.max_speed is not None:
+            np.clip(vel, -self.max_speed, self.max_speed, out=vel)
+
+        vel[:, 1] += self.gravity
+
+        self.old[free] = pos[free]
+        pos[free] += vel
+
+        self._dragged = dragging
+        self._vel = vel
+
+    def max_move(self):
+
+        # Bound on how far any particle moved in the last step: a drag
+        # snaps by less than drag_radius, then each velocity is added.
+        # Clamped velocities need no scan.
+        move = self.drag_radius if self._dragged else 0.0
+        vel = self._vel
+
+        if vel is None or not len(vel):
+            return move
+
+        if self.max_speed is not None:
+            return move + float(np.hypot(self.max_speed, self.max_speed + abs(self.gravity)))
+
+        return move + float(np.hypot(*np.abs(vel).max(axis=0)))
@@ -1,107 +1,97 @@
+import os
+
 import pygame
-import math
 
-pygame.init()
+from cloth.record import Recorder
+from cloth.render import Polylines, hue_table
+from cloth.scene import Cloth
+from cloth.timestep import FixedStep
 
-# Fullscreen window
-s = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-W, H = s.get_size()
-clock = pygame.time.Clock()
+# Stick colours: hue lookup table in 5 degree steps
+HUES = hue_table(72)
 
-# Points: [x, y, old_x, old_y, pinned]
-P = [
-    [x * 20 + 200, y * 20 + 50,
-     x * 20 + 200, y * 20 + 50,
-     y == 0]
-    for y in range(35)
-    for x in range(55)
-]
+# Physics runs at a fixed rate, independent of the render rate; frames
+# draw the cloth interpolated between the last two physics states.
+PHYSICS_HZ = 60
+RENDER_FPS = 60
 
-# Sticks: [index1, index2, active]
-S = (
-    [[i, i + 1, 1] for i in range(len(P)) if (i + 1) % 55] +
-    [[i, i + 55, 1] for i in range(len(P) - 55)]
-)
 
-while True:
+def main():
 
-    # Exit handling
-    for e in pygame.event.get():
-        if (
-            e.type == pygame.QUIT or
-            (e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE)
-        ):
-            pygame.quit()
-            exit()
+    pygame.init()
 
-    s.fill((5, 5, 15))
+    # Fullscreen window
+    s = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    W, H = s.get_size()
+    clock = pygame.time.Clock()
 
-    mx, my = pygame.mouse.get_pos()
-    md = pygame.mouse.get_pressed()
+    # Cloth: 55x35 particles, top row pinned; pieces torn off and fallen
+    # out of the screen are retired.
+    # CLOTH_WORKERS=N relaxes colour classes across N threads
+    # (CLOTH_PROCESSES=1 for processes over shared memory).
+    cloth = Cloth.grid(
+        55, 35,
+        preset="fun1",
+        origin=(200, 50),
+        view=(0, 0, W, H),
+        workers=int(os.environ.get("CLOTH_WORKERS", 0)),
+        processes=bool(int(os.environ.get("CLOTH_PROCESSES", 0)))
+    )
+    sticks = cloth.sticks
+    lines = Polylines(2)
 
-    # Update points (Verlet integration)
-    for p in P:
-        if not p[4]:  # not pinned
+    physics = FixedStep(PHYSICS_HZ, max_substeps=5)
+    elapsed = 0
 
-            # Drag with left mouse
-            if md[0] and math.hypot(p[0] - mx, p[1] - my) < 35:
-                p[0], p[1] = mx, my
+    # CLOTH_RECORD=path records every physics step for replay
+    # (python -m cloth.record play path)
+    recorder = None
 
-            # Verlet motion
-            new_x = p[0] + (p[0] - p[2]) * 0.98
-            new_y = p[1] + (p[1] - p[3]) * 0.98 + 0.5  # gravity
+    if os.environ.get("CLOTH_RECORD"):
+        recorder = Recorder(os.environ["CLOTH_RECORD"], cloth)
 
-            p[2], p[3] = p[0], p[1]
-            p[0], p[1] = new_x, new_y
+    running = True
+    while running:
 
-    # Constraint solving
-    for _ in range(5):
-        for sk in [k for k in S if k[2]]:
+        # Exit handling
+        for e in pygame.event.get():
+            if (
+                e.type == pygame.QUIT or
+                (e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE)
+            ):
+                running = False
 
-            p1 = P[sk[0]]
-            p2 = P[sk[1]]
+        s.fill((5, 5, 15))
 
-            dx = p2[0] - p1[0]
-            dy = p2[1] - p1[1]
-            d = math.hypot(dx, dy)
+        mx, my = pygame.mouse.get_pos()
+        md = pygame.mouse.get_pressed()
 
-            # Break stick
-            if (
-                d > 70 or
-                (md[2] and
-                 math.hypot((p1[0] + p2[0]) / 2 - mx,
-                            (p1[1] + p2[1]) / 2 - my) < 20)
-            ):
-                sk[2] = 0
-                continue
-
-            f = (20 - d) / (d or 0.1) * 0.5
-
-            if not p1[4]:
-                p1[0] -= dx * f
-                p1[1] -= dy * f
-
-            if not p2[4]:
-                p2[0] += dx * f
-                p2[1] += dy * f
-
-    # Draw sticks
-    for p1, p2, active in [k for k in S if k[2]]:
-        c = pygame.Color(0)
-        c.hsva = (
-            (P[p1][0] * 0.1 + pygame.time.get_ticks() * 0.1) % 360,
-            100,
-            100,
-            100
-        )
+        # Fixed physics steps (left mouse drags, right mouse tears)
+        for _ in range(physics.advance(elapsed)):
+            cloth.step(mx, my, md)
 
-        pygame.draw.line(
+            if recorder:
+                recorder.write(cloth, mx, my, md)
+
+        # Draw sticks, one polyline per run of equal quantized hue
+        lines.draw_hue(
             s,
-            c,
-            (P[p1][0], P[p1][1]),
-            (P[p2][0], P[p2][1]),
-            2
+            sticks,
+            cloth.lerp(physics.alpha),
+            pygame.time.get_ticks(),
+            HUES
         )
 
-    pygame.display.flip()
-    clock.tick(60)
\ No newline at end of file
+        pygame.display.flip()
+        elapsed = clock.tick(RENDER_FPS) / 1000
+
+    cloth.close()
+
+    if recorder:
+        recorder.close()
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,758 @@
 """
-Vector/Matrix Calculator CLI: 
-Create a command-line interface tool that takes vector and matrix inputs and performs operations 
-based on user commands. 
-"""
\ No newline at end of file
+Vector/Matrix Calculator CLI:
+Create a command-line interface tool that takes vector and matrix inputs and performs operations
+based on user commands.
+
+Reads one command per line, from a file, stdin ('-') or an interactive
+prompt, and writes each result as soon as it is computed.  A command is
+either a line of the calculator language
+
+    a = [1, 2, 3]
+    M = [[2, 0, 0], [0, 3, 0], [0, 0, 4]]
+    M @ a + 2 * a
+    x = solve(M, a)
+    dot(a, x), norm(cross(a, x))        # several results on one line
+
+or a JSON object:
+
+    {"name": "a", "value": [1, 2, 3]}
+    {"expr": "M @ a", "name": "b", "id": 7}
+    {"op": "dot", "args": ["a", [4, 5, 6]]}
+
+Brackets give vectors ([1, 2]) and matrices ([[1, 2], [3, 4]]).
+Operators are + - * / @ and unary minus.  @ multiplies matrices, applies a
+matrix to a vector, or takes the dot product of two vectors.  The functions
+are listed in FUNCTIONS.  Names persist between commands.  Each
+sub-expression's result is memoized against the versions of the names it
+reads, so repeated work is looked up rather than recomputed.
+
+    python CLI.py                          # interactive
+    python CLI.py ops.txt
+    python CLI.py - --format json < ops.jsonl
+    python CLI.py ops.txt --timing         # per-command ms, summary on stderr
+
+JSON commands are answered with JSON lines ({"result": ..., "name": ...,
+"id": ..., "ms": ...}) and calculator lines with text, unless --format
+picks one for all.  An error is reported on its line and the stream goes
+on; the exit status is 1 if any command failed.
+"""
+
+import argparse
+import json
+import operator
+import os
+import re
+import sys
+import time
+from fractions import Fraction
+from numbers import Number
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "vector1"))
+
+from linalg.matrix import Matrix, NotSquareMatrixError, SingularMatrixError
+from linalg.vector import Vector, DimensionMismatchError
+
+
+# Memoized sub-expression results kept before the table is cleared
+MEMO_SIZE = 4096
+
+# Reported on the command's line; anything else is a bug and stops the run
+ERRORS = (
+    ArithmeticError, ValueError, TypeError, RecursionError,
+    DimensionMismatchError, NotSquareMatrixError, SingularMatrixError,
+)
+
+TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+      | (?P<name>[A-Za-z_]\w*)
+      | (?P<sym>\S)
+    )""", re.VERBOSE)
+
+
+def _transpose(m):
+
+    if not isinstance(m, Matrix):
+        raise TypeError("transpose expects a matrix")
+
+    return m.transpose()
+
+
+def _dot(a, b):
+
+    if not (isinstance(a, Vector) and isinstance(b, Vector)):
+        raise TypeError("dot expects two vectors")
+
+    return a.dot(b)
+
+
+def _cross(a, b):
+
+    if not (isinstance(a, Vector) and isinstance(b, Vector)):
+        raise TypeError("cross expects two vectors")
+
+    return a.cross(b)
+
+
+def _norm(v):
+
+    if not isinstance(v, Vector):
+        raise TypeError("norm expects a vector")
+
+    return v.norm()
+
+
+def _matrix_fn(name):
+
+    def fn(m, *args):
+
+        if not isinstance(m, Matrix):
+            raise TypeError("%s expects a matrix" % name)
+
+        return getattr(m, name)(*args)
+
+    return fn
+
+
+def _unit(v):
+    return v * (1 / _norm(v))
+
+
+def _divide(a, b):
+
+    if not isinstance(b, Number):
+        raise TypeError("Can only divide by a scalar")
+
+    if isinstance(a, Number):
+        return a / b
+
+    return a * (1 / b)
+
+
+def _matmul(a, b):
+
+    if isinstance(a, Number) or isinstance(b, Number):
+        raise TypeError("@ needs vector or matrix operands")
+
+    return a @ b
+
+
+# name: (function, argument count)
+FUNCTIONS = {
+    "dot": (_dot, 2),
+    "cross": (_cross, 2),
+    "norm": (_norm, 1),
+    "unit": (_unit, 1),
+    "transpose": (_transpose, 1),
+    "T": (_transpose, 1),
+    "det": (_matrix_fn("det"), 1),
+    "inv": (_matrix_fn("inverse"), 1),
+    "rank": (_matrix_fn("rank"), 1),
+    "solve": (_matrix_fn("solve"), 2),
+}
+
+OPERATORS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": _divide,
+    "@": _matmul,
+}
+
+# JSON "op" names
+OP_NAMES = {"add": "+", "sub": "-", "mul": "*", "div": "/", "matmul": "@"}
+
+
+class CalcError(Exception):
+    pass
+
+
+def tokenize(text):
+
+    tokens = []
+    pos = 0
+    text = text.split("#", 1)[0].rstrip()
+
+    while pos < len(text):
+        match = TOKEN.match(text, pos)
+
+        if match.group("num"):
+            s = match.group("num")
+            tokens.append(("num", float(s) if "." in s or "e" in s or "E" in s else int(s)))
+        elif match.group("name"):
+            tokens.append(("name", match.group("name")))
+        elif match.group("sym"):
+            tokens.append(("sym", match.group("sym")))
+
+        pos = match.end()
+
+    return tokens
+
+
+class Parser:
+
+    # Recursive descent over one line.  Expressions become nested tuples:
+    # ("num", x), ("name", n), ("lit", rows), ("neg", e), ("op", sym, a, b)
+    # and ("call", fn, args).
+
+    def __init__(self, tokens):
+
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self, sym=None):
+
+        tok = self.peek()
+
+        if sym is not None and tok != ("sym", sym):
+            raise CalcError("Expected '%s'" % sym)
+
+        if tok[0] is None:
+            raise CalcError("Unexpected end of line")
+
+        self.pos += 1
+
+        return tok
+
+    def line(self):
+
+        # [name =] expr {, expr}; returns (name, [expressions])
+        name = None
+
+        if (len(self.tokens) > 1 and self.tokens[0][0] == "name"
+                and self.tokens[1] == ("sym", "=")):
+            name = self.tokens[0][1]
+            self.pos = 2
+
+        exprs = [self.expr()]
+
+        while self.peek() == ("sym", ","):
+            self.take()
+            exprs.append(self.expr())
+
+        if self.peek()[0] is not None:
+            raise CalcError("Unexpected '%s'" % self.peek()[1])
+
+        if name is not None and len(exprs) > 1:
+            raise CalcError("Can only assign one value")
+
+        return name, exprs
+
+    def expr(self):
+
+        node = self.term()
+
+        while self.peek() in (("sym", "+"), ("sym", "-")):
+            sym = self.take()[1]
+            node = ("op", sym, node, self.term())
+
+        return node
+
+    def term(self):
+
+        node = self.unary()
+
+        while self.peek() in (("sym", "*"), ("sym", "/"), ("sym", "@")):
+            sym = self.take()[1]
+            node = ("op", sym, node, self.unary())
+
+        return node
+
+    def unary(self):
+
+        if self.peek() == ("sym", "-"):
+            self.take()
+            node = self.unary()
+
+            return ("num", -node[1]) if node[0] == "num" else ("neg", node)
+
+        if self.peek() == ("sym", "+"):
+            self.take()
+            return self.unary()
+
+        return self.atom()
+
+    def atom(self):
+
+        kind, value = self.take()
+
+        if kind == "num":
+            return ("num", value)
+
+        if kind == "name":
+
+            if self.peek() != ("sym", "("):
+                return ("name", value)
+
+            self.take("(")
+            args = []
+
+            if self.peek() != ("sym", ")"):
+                args.append(self.expr())
+
+                while self.peek() == ("sym", ","):
+                    self.take()
+                    args.append(self.expr())
+
+            self.take(")")
+
+            return ("call", value, tuple(args))
+
+        if value == "(":
+            node = self.expr()
+            self.take(")")
+            return node
+
+        if value == "[":
+            self.pos -= 1
+            return ("lit", self.literal())
+
+        raise CalcError("Unexpected '%s'" % value)
+
+    def literal(self):
+
+        # Nested brackets of numbers, as nested tuples
+        self.take("[")
+        items = []
+
+        if self.peek() != ("sym", "]"):
+            items.append(self.item())
+
+            while self.peek() == ("sym", ","):
+                self.take()
+                items.append(self.item())
+
+        self.take("]")
+
+        return tuple(items)
+
+    def item(self):
+
+        if self.peek() == ("sym", "["):
+            return self.literal()
+
+        sign = 1
+
+        if self.peek() == ("sym", "-"):
+            self.take()
+            sign = -1
+
+        kind, value = self.take()
+
+        if kind != "num":
+            raise CalcError("Brackets may only hold numbers")
+
+        return sign * value
+
+
+def to_value(data):
+
+    # JSON or literal data: a number, a vector or a matrix
+    if isinstance(data, str):
+        return Fraction(data)
+
+    if isinstance(data, Number):
+        return data
+
+    if not data or not isinstance(data[0], (list, tuple)):
+        if not all(isinstance(x, Number) for x in data):
+            raise CalcError("Vector entries must be numbers")
+
+        return Vector(list(data))
+
+    if not all(isinstance(row, (list, tuple)) for row in data):
+        raise CalcError("Matrix rows must all be lists")
+
+    cols = len(data[0])
+    rows = [list(row) for row in data]
+
+    if any(len(row) != cols or not all(isinstance(x, Number) for x in row) for row in rows):
+        raise CalcError("Matrix rows must be numbers, all the same length")
+
+    return Matrix(rows)
+
+
+def to_data(value):
+
+    # JSON-ready form of a result
+    if isinstance(value, Vector):
+        return [to_data(x) for x in value.data]
+
+    if isinstance(value, Matrix):
+        return [[to_data(x) for x in row] for row in value.data]
+
+    if isinstance(value, Fraction):
+        return value.numerator if value.denominator == 1 else str(value)
+
+    return value
+
+
+def show(value):
+    return json.dumps(to_data(value)).replace('"', "")
+
+
+class Session:
+
+    # Named operands, their versions and the memo of evaluated
+    # sub-expressions.  A sub-expression's memo key is its tree with every
+    # name replaced by (name, version); assigning a name gives it a new
+    # version, so stale entries are never matched again.
+
+    def __init__(self, memo_size=MEMO_SIZE):
+
+        self.names = {}
+        self.versions = {}
+        self.clock = 0
+
+        self.memo = {}
+        self.memo_size = memo_size
+        self.parsed = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def assign(self, name, value):
+
+        self.clock += 1
+        self.names[name] = value
+        self.versions[name] = self.clock
+
+    def parse(self, text):
+
+        # Parsed lines are cached too; streams repeat themselves
+        tree = self.parsed.get(text)
+
+        if tree is None:
+            tree = Parser(tokenize(text)).line()
+
+            if len(self.parsed) >= self.memo_size:
+                self.parsed.clear()
+
+            self.parsed[text] = tree
+
+        return tree
+
+    def evaluate(self, node):
+        return self._eval(node)[0]
+
+    def _eval(self, node):
+
+        # (value, memo key)
+        kind = node[0]
+
+        if kind == "num":
+            # The type keeps 2, 2.0 and Fraction(2) apart (they compare equal)
+            return node[1], ("num", type(node[1]).__name__, node[1])
+
+        if kind == "name":
+            name = node[1]
+
+            if name not in self.names:
+                raise CalcError("Unknown name: %s" % name)
+
+            return self.names[name], ("name", name, self.versions[name])
+
+        if kind == "lit":
+            # repr keeps [1, 2] and [1.0, 2.0] apart
+            key = ("lit", repr(node[1]))
+            args = ()
+        elif kind == "neg":
+            args = (self._eval(node[1]),)
+            key = ("neg", args[0][1])
+        elif kind == "op":
+            args = (self._eval(node[2]), self._eval(node[3]))
+            key = ("op", node[1], args[0][1], args[1][1])
+        else:
+            if node[1] not in FUNCTIONS:
+                raise CalcError("Unknown function: %s" % node[1])
+
+            args = tuple(self._eval(a) for a in node[2])
+            key = ("call", node[1]) + tuple(k for _, k in args)
+
+        if key in self.memo:
+            self.hits += 1
+            return self.memo[key], key
+
+        self.misses += 1
+        value = self._apply(node, [v for v, _ in args])
+
+        if len(self.memo) >= self.memo_size:
+            self.memo.clear()
+
+        self.memo[key] = value
+
+        return value, key
+
+    def _apply(self, node, args):
+
+        kind = node[0]
+
+        try:
+            if kind == "lit":
+                return to_value(node[1])
+
+            if kind == "neg":
+                return -args[0]
+
+            if kind == "op":
+                return OPERATORS[node[1]](*args)
+
+            fn, count = FUNCTIONS[node[1]]
+
+            if len(args) != count:
+                raise CalcError("%s takes %d argument%s" % (node[1], count, "" if count == 1 else "s"))
+
+            return fn(*args)
+
+        except TypeError as e:
+            # Unsupported operand kinds come back from the operators as
+            # Python's own message; name them plainly instead
+            if kind == "op":
+                raise CalcError("Cannot apply '%s' to %s and %s" % (
+                    node[1], _kind(args[0]), _kind(args[1])
+                )) from e
+
+            raise CalcError(str(e)) from e
+
+    def run_text(self, text):
+
+        # One calculator line; returns (name, [results])
+        name, exprs = self.parse(text)
+        results = [self.evaluate(e) for e in exprs]
+
+        if name is not None:
+            self.assign(name, results[0])
+
+        return name, results
+
+    def run_json(self, command):
+
+        # One JSON command; returns (name, [results])
+        if not isinstance(command, dict):
+            raise CalcError("JSON commands must be objects")
+
+        name = command.get("name")
+
+        if name is not None and not isinstance(name, str):
+            raise CalcError("name must be a string")
+
+        if "value" in command:
+            node = ("lit", _freeze(command["value"]))
+        elif "expr" in command:
+            if not isinstance(command["expr"], str):
+                raise CalcError("expr must be a string")
+
+            target, exprs = self.parse(command["expr"])
+
+            if target is not None or len(exprs) != 1:
+                raise CalcError("expr must be a single expression")
+
+            node = exprs[0]
+        elif "op" in command:
+            node = _json_op(command["op"], command.get("args", []))
+        else:
+            raise CalcError("JSON commands need value, expr or op")
+
+        result = self.evaluate(node)
+
+        if name is not None:
+            self.assign(name, result)
+
+        return name, [result]
+
+
+def _kind(value):
+
+    if isinstance(value, Vector):
+        return "vector(%d)" % value.n
+
+    if isinstance(value, Matrix):
+        return "matrix(%dx%d)" % (value.rows, value.cols)
+
+    return "scalar"
+
+
+def _freeze(data):
+
+    # JSON data as a literal node: nested tuples, "p/q" strings read exactly
+    if isinstance(data, list):
+        return tuple(_freeze(x) for x in data)
+
+    if isinstance(data, str):
+        return Fraction(data)
+
+    if not isinstance(data, Number) or isinstance(data, bool):
+        raise CalcError("Values must be numbers, strings or lists")
+
+    return data
+
+
+def _json_op(op, args):
+
+    if not isinstance(op, str):
+        raise CalcError("op must be a string")
+
+    if not isinstance(args, list):
+        raise CalcError("args must be a list")
+
+    nodes = []
+
+    for a in args:
+        if isinstance(a, str):
+            nodes.append(("name", a))
+        elif isinstance(a, list):
+            nodes.append(("lit", _freeze(a)))
+        else:
+            nodes.append(("num", _freeze(a)))
+
+    if op in OP_NAMES:
+        if len(nodes) != 2:
+            raise CalcError("%s takes 2 arguments" % op)
+
+        return ("op", OP_NAMES[op], nodes[0], nodes[1])
+
+    if op == "neg":
+        if len(nodes) != 1:
+            raise CalcError("neg takes 1 argument")
+
+        return ("neg", nodes[0])
+
+    return ("call", op, tuple(nodes))
+
+
+def run(lines, out, fmt="auto", timing=False, prompt=None):
+
+    # Runs every command in `lines`, writing results to `out` as they come.
+    # Returns (commands, errors, seconds spent computing, session).
+    session = Session()
+    commands = 0
+    errors = 0
+    spent = 0.0
+
+    while True:
+
+        if prompt is not None:
+            try:
+                line = input(prompt)
+            except EOFError:
+                break
+        else:
+            line = next(lines, None)
+
+            if line is None:
+                break
+
+        text = line.strip()
+
+        if not text or text.startswith("#"):
+            continue
+
+        commands += 1
+        is_json = text.startswith("{")
+        command = None
+
+        start = time.perf_counter()
+
+        try:
+            if is_json:
+                command = json.loads(text)
+                name, results = session.run_json(command)
+            else:
+                name, results = session.run_text(text)
+
+            error = None
+
+        except (CalcError,) + ERRORS as e:
+            error = str(e) or type(e).__name__
+            errors += 1
+
+        ms = (time.perf_counter() - start) * 1000
+        spent += ms / 1000
+
+        as_json = fmt == "json" or (fmt == "auto" and is_json)
+
+        if as_json:
+            report = {"line": commands}
+
+            if isinstance(command, dict) and "id" in command:
+                report["id"] = command["id"]
+
+            if error is not None:
+                report["error"] = error
+            else:
+                report["result"] = to_data(results[0]) if len(results) == 1 else [to_data(r) for r in results]
+
+                if name is not None:
+                    report["name"] = name
+
+            if timing:
+                report["ms"] = round(ms, 4)
+
+            text = json.dumps(report)
+
+        elif error is not None:
+            text = "error (line %d): %s" % (commands, error)
+        else:
+            text = ", ".join(show(r) for r in results)
+
+            if name is not None:
+                text = "%s = %s" % (name, text)
+
+            if timing:
+                text += "    (%.3f ms)" % ms
+
+        out.write(text + "\n")
+        out.flush()
+
+    return commands, errors, spent, session
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Vector / matrix calculator")
+    parser.add_argument("path", nargs="?",
+                        help="command file ('-' for stdin); interactive if omitted")
+    parser.add_argument("--format", choices=["auto", "text", "json"], default="auto",
+                        help="output format (auto answers JSON with JSON)")
+    parser.add_argument("--timing", action="store_true",
+                        help="report per-command time and a summary on stderr")
+    args = parser.parse_args(argv)
+
+    interactive = args.path is None and sys.stdin.isatty()
+    start = time.perf_counter()
+
+    try:
+        if interactive:
+            result = run(None, sys.stdout, args.format, args.timing, prompt="> ")
+        elif args.path in (None, "-"):
+            result = run(iter(sys.stdin), sys.stdout, args.format, args.timing)
+        else:
+            with open(args.path) as f:
+                result = run(iter(f), sys.stdout, args.format, args.timing)
+
+    except BrokenPipeError:
+        # Reader went away (e.g. piped into head); stop quietly
+        sys.stderr.close()
+        return 1
+
+    commands, errors, spent, session = result
+    total = time.perf_counter() - start
+
+    if args.timing:
+        sys.stderr.write(
+            "%d commands, %d errors in %.3f s (%.3f s computing): %.0f commands/s; "
+            "memo %d hits, %d misses\n" % (
+                commands, errors, total, spent,
+                commands / total if total else 0.0,
+                session.hits, session.misses
+            )
+        )
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,224 @@
 """
-Linear Equation Solver: 
+Linear Equation Solver:
 Implement algorithms like Gaussian elimination to solve systems of linear equations represented in matrix form.
-"""
\ No newline at end of file
+
+Direct solves use Gaussian elimination with partial pivoting, kept as an
+LU factorization (linalg.lu) so one system can be solved against any
+number of right-hand sides without refactoring.  Large sparse systems use
+Conjugate Gradient or Gauss-Seidel / SOR (linalg.iterative) on a CSR
+matrix (linalg.sparse).  Integer and rational systems solve exactly with
+Bareiss fraction-free elimination (linalg.exact).
+
+    python lnr_eq_solver.py system.json
+    python lnr_eq_solver.py system.json --method cg --tol 1e-10
+    python lnr_eq_solver.py - --method sor --omega 1.5 < system.json
+    python lnr_eq_solver.py system.json --method exact
+
+The JSON holds "A" and "b".  "A" is a list of rows, or sparse as
+{"shape": [rows, cols], "triplets": [[i, j, value], ...]}.  "b" may be
+one right-hand side or a list of them.  Entries may be written as strings
+like "1/3"; exact results are printed that way too.  Prints each solution
+as JSON, with the determinant (lu, exact) or iteration counts and
+residuals (iterative).  Singular or unsuitable systems and malformed
+input are reported on one stderr line, with exit status 1.
+"""
+
+import argparse
+import json
+import os
+import sys
+from fractions import Fraction
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "vector1"))
+
+from linalg import exact
+from linalg.iterative import conjugate_gradient, sor
+from linalg.lu import LU
+from linalg.matrix import Matrix, NotSquareMatrixError, SingularMatrixError
+from linalg.sparse import CSRMatrix
+from linalg.vector import DimensionMismatchError
+
+
+METHODS = ["lu", "exact", "cg", "gauss-seidel", "sor"]
+
+# Reported as one line on stderr; anything else is a bug
+ERRORS = (
+    OSError, KeyError, ArithmeticError, ValueError, TypeError,
+    DimensionMismatchError, NotSquareMatrixError, SingularMatrixError,
+)
+
+
+def number(x):
+
+    # JSON number, or a string such as "1/3" or "2.5" read exactly
+    if isinstance(x, str):
+        return Fraction(x)
+
+    if isinstance(x, list):
+        return [number(v) for v in x]
+
+    return x
+
+
+def show(x):
+
+    # Fractions as "p/q" strings for JSON
+    if isinstance(x, Fraction):
+        return str(x)
+
+    if isinstance(x, list):
+        return [show(v) for v in x]
+
+    return x
+
+
+def load_matrix(a):
+
+    # A list of rows, or {"shape": [rows, cols], "triplets": [...]}
+    if isinstance(a, dict):
+        rows, cols = a["shape"]
+        return CSRMatrix.from_triplets(rows, cols, a["triplets"])
+
+    return a if isinstance(a, (Matrix, CSRMatrix)) else Matrix(number(a))
+
+
+def factor(a):
+
+    # LU factorization of a list of rows, a Matrix or a CSRMatrix; an LU
+    # is returned as is, so a factorization can be passed to solve()
+    if isinstance(a, LU):
+        return a
+
+    a = load_matrix(a)
+
+    if isinstance(a, CSRMatrix):
+        a = a.to_dense()
+
+    return LU(a)
+
+
+def _many(b):
+    return bool(b) and isinstance(b[0], (list, tuple))
+
+
+def solve(a, b, method="lu", tol=1e-8, max_iter=None, omega=1.5):
+
+    # x with Ax = b; b may be one right-hand side or a list of them.
+    # For "lu", a may already be an LU from factor().
+    # Iterative methods return linalg.iterative.Solution objects, direct
+    # solves plain lists.
+    if method == "lu":
+        lu = factor(a)
+
+        if _many(b):
+            return [x.data for x in lu.solve_many(b)]
+
+        return lu.solve(b).data
+
+    a = load_matrix(a)
+
+    if method == "exact":
+        if isinstance(a, CSRMatrix):
+            a = a.to_dense()
+
+        b = number(b)
+
+        if _many(b):
+            return [exact.solve(a, rhs).data for rhs in b]
+
+        return exact.solve(a, b).data
+
+    if isinstance(a, Matrix):
+        a = CSRMatrix.from_dense(a)
+
+    if method == "cg":
+        run = lambda rhs: conjugate_gradient(a, rhs, tol=tol, max_iter=max_iter)
+    elif method in ("gauss-seidel", "sor"):
+        w = 1.0 if method == "gauss-seidel" else omega
+        run = lambda rhs: sor(a, rhs, w, tol=tol, max_iter=max_iter or 10000)
+    else:
+        raise ValueError("Unknown method: %s" % method)
+
+    if _many(b):
+        return [run(rhs) for rhs in b]
+
+    return run(b)
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Solve Ax = b")
+    parser.add_argument("path", help="JSON file with A and b ('-' for stdin)")
+    parser.add_argument("--method", choices=METHODS, default="lu")
+    parser.add_argument("--tol", type=float, default=1e-8,
+                        help="relative residual target (iterative methods)")
+    parser.add_argument("--max-iter", type=int,
+                        help="iteration limit (iterative methods)")
+    parser.add_argument("--omega", type=float, default=1.5,
+                        help="SOR relaxation factor in (0, 2)")
+    args = parser.parse_args(argv)
+
+    try:
+        result = _run(args)
+
+    except ERRORS as e:
+        msg = "missing %s" % e if isinstance(e, KeyError) else str(e) or type(e).__name__
+        sys.stderr.write("%s: error: %s\n" % (parser.prog, msg))
+        return 1
+
+    json.dump(result, sys.stdout, indent=2)
+    print()
+
+    return 0
+
+
+def _run(args):
+
+    if args.path == "-":
+        system = json.load(sys.stdin)
+    else:
+        with open(args.path) as f:
+            system = json.load(f)
+
+    b = number(system["b"])
+
+    if args.method == "lu":
+        lu = factor(system["A"])
+        return {"x": solve(lu, b), "det": lu.det()}
+
+    if args.method == "exact":
+        a = load_matrix(system["A"])
+        a = a.to_dense() if isinstance(a, CSRMatrix) else a
+
+        return {
+            "x": show(solve(a, b, method="exact")),
+            "det": show(exact.det(a)),
+        }
+
+    out = solve(
+        system["A"], b,
+        method=args.method,
+        tol=args.tol,
+        max_iter=args.max_iter,
+        omega=args.omega
+    )
+
+    # One right-hand side reports plain values, several report lists
+    if not _many(b):
+        return {
+            "x": out.x.data,
+            "iterations": out.iterations,
+            "residual": out.residual,
+            "converged": out.converged,
+        }
+
+    return {
+        "x": [s.x.data for s in out],
+        "iterations": [s.iterations for s in out],
+        "residual": [s.residual for s in out],
+        "converged": all(s.converged for s in out),
+    }
+
+
+if __name__ == "__main__":
+    sys.exit(main())
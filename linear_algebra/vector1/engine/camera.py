@@ -22,21 +22,34 @@
 
 import math
 
+from linalg.fast import Matrix4
+
 
 class Camera:
 
+    # Orbit camera: yaw about Y, then pitch about X, then `distance` back
+    # along Z, with a 400 px focal length.  The rotation and translation
+    # are kept as one 4x4 view transform, rebuilt by update() whenever yaw
+    # or pitch change through rotate(); call update() yourself after
+    # setting yaw, pitch, distance or the screen size directly.  The
+    # perspective divide and screen centre are applied per point, in the
+    # same order as before, so results match the old per-call trig exactly.
+
     def __init__(self, width, height):
 
         self.width = width
         self.height = height
 
         self.distance = 15
+        self.focal = 400
 
         self.yaw = 0
         self.pitch = -0.4
 
         self.sensitivity = 0.005
 
+        self.update()
+
     def rotate(self, dx, dy):
 
         self.yaw += dx * self.sensitivity
@@ -45,38 +58,74 @@ class Camera:
         # limit vertical rotation
         self.pitch = max(-1.5, min(1.5, self.pitch))
 
-    def project(self, vector):
+        self.update()
 
-        x, y, z = vector.data
+    def update(self):
 
-        # --- Y rotation (yaw) ---
+        # View rows: x' = rx . p, y' = ry . p, depth = rz . p + distance
         cos_y = math.cos(self.yaw)
         sin_y = math.sin(self.yaw)
+        cos_p = math.cos(self.pitch)
+        sin_p = math.sin(self.pitch)
 
-        xz = x * cos_y - z * sin_y
-        zz = x * sin_y + z * cos_y
+        rx = (cos_y, 0.0, -sin_y, 0.0)
+        ry = (-sin_y * sin_p, cos_p, -cos_y * sin_p, 0.0)
+        rz = (sin_y * cos_p, sin_p, cos_y * cos_p, self.distance)
 
-        x = xz
-        z = zz
+        self.view = Matrix4(rx + ry + rz + (0.0, 0.0, 0.0, 1.0))
 
-        # --- X rotation (pitch) ---
-        cos_p = math.cos(self.pitch)
-        sin_p = math.sin(self.pitch)
+        self.center_x = self.width / 2
+        self.center_y = self.height / 2
+
+    def project(self, vector):
 
-        yz = y * cos_p - z * sin_p
-        zz = y * sin_p + z * cos_p
+        # Screen point of a Vector / Vector3, or None behind the camera
+        (a00, a01, a02, _,
+         a10, a11, a12, _,
+         a20, a21, a22, a23, *_) = self.view.m
 
-        y = yz
-        z = zz
+        x, y, z = vector.data
 
-        z += self.distance
+        w = a20*x + a21*y + a22*z + a23
 
-        if z <= 0:
+        if w <= 0:
             return None
 
-        factor = 400 / z
+        factor = self.focal / w
+
+        return (int((a00*x + a01*y + a02*z) * factor + self.center_x),
+                int(-(a10*x + a11*y + a12*z) * factor + self.center_y))
+
+    def project_many(self, coords):
+
+        # Screen points of a flat x, y, z, x, y, z, ... sequence in one
+        # pass; points behind the camera come back as None
+        if len(coords) % 3:
+            raise ValueError("Coordinates must come in x, y, z triples")
+
+        (a00, a01, a02, _,
+         a10, a11, a12, _,
+         a20, a21, a22, a23, *_) = self.view.m
+
+        f = self.focal
+        cx = self.center_x
+        cy = self.center_y
+
+        it = iter(coords)
+        out = []
+        append = out.append
+
+        for x, y, z in zip(it, it, it):
+
+            w = a20*x + a21*y + a22*z + a23
+
+            if w <= 0:
+                append(None)
+                continue
+
+            factor = f / w
 
-        screen_x = x * factor + self.width / 2
-        screen_y = -y * factor + self.height / 2
+            append((int((a00*x + a01*y + a02*z) * factor + cx),
+                    int(-(a10*x + a11*y + a12*z) * factor + cy)))
 
-        return (int(screen_x), int(screen_y))
\ No newline at end of file
+        return out
@@ -43,7 +43,6 @@
 #             pygame.draw.line(self.screen, grid_color, p1, p2, 1)
 
 import pygame
-from linalg.vector import Vector
 
 
 class Renderer:
@@ -53,56 +52,58 @@ class Renderer:
         self.screen = screen
         self.camera = camera
 
+        # (size, step) -> flat endpoint coordinates of the grid lines
+        self._grids = {}
+
     def draw_vector(self, vector, color=(255,255,255)):
 
-        origin = self.camera.project(Vector([0,0,0]))
-        end = self.camera.project(vector)
+        origin, end = self.camera.project_many((0, 0, 0) + tuple(vector.data))
 
         if origin and end:
             pygame.draw.line(self.screen, color, origin, end, 3)
             pygame.draw.circle(self.screen, color, end, 5)
 
-    def draw_grid(self, size=50, step=1):
+    def _grid(self, size, step):
 
-        grid_color = (50,50,50)
+        coords = self._grids.get((size, step))
 
-        # X lines
-        for x in range(-size, size+1, step):
+        if coords is None:
+            coords = []
 
-            start = Vector([x,0,-size])
-            end   = Vector([x,0,size])
+            # X lines, then Z lines, as start / end pairs
+            for x in range(-size, size+1, step):
+                coords += (x, 0, -size, x, 0, size)
 
-            p1 = self.camera.project(start)
-            p2 = self.camera.project(end)
+            for z in range(-size, size+1, step):
+                coords += (-size, 0, z, size, 0, z)
 
-            if p1 and p2:
-                pygame.draw.line(self.screen, grid_color, p1, p2, 1)
+            self._grids[size, step] = coords
 
-        # Z lines
-        for z in range(-size, size+1, step):
+        return coords
 
-            start = Vector([-size,0,z])
-            end   = Vector([size,0,z])
+    def draw_grid(self, size=50, step=1):
+
+        grid_color = (50,50,50)
 
-            p1 = self.camera.project(start)
-            p2 = self.camera.project(end)
+        points = self.camera.project_many(self._grid(size, step))
 
+        for p1, p2 in zip(points[0::2], points[1::2]):
             if p1 and p2:
                 pygame.draw.line(self.screen, grid_color, p1, p2, 1)
 
     def draw_axes(self):
 
         axes = [
-            (Vector([5,0,0]), (255,0,0)),   # X
-            (Vector([0,5,0]), (0,255,0)),   # Y
-            (Vector([0,0,5]), (0,0,255)),   # Z
+            ((5,0,0), (255,0,0)),   # X
+            ((0,5,0), (0,255,0)),   # Y
+            ((0,0,5), (0,0,255)),   # Z
         ]
 
-        origin = self.camera.project(Vector([0,0,0]))
-
-        for v, color in axes:
+        origin, *ends = self.camera.project_many(
+            (0, 0, 0) + sum((v for v, _ in axes), ())
+        )
 
-            end = self.camera.project(v)
+        for end, (_, color) in zip(ends, axes):
 
             if origin and end:
-                pygame.draw.line(self.screen, color, origin, end, 3)
\ No newline at end of file
+                pygame.draw.line(self.screen, color, origin, end, 3)
@@ -0,0 +1,308 @@
+import math
+import operator
+import os
+from contextlib import contextmanager
+from operator import mul
+
+from linalg import parallel
+from linalg.multiply import blocked, matmul
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# "auto" hands operations on at least this many elements to NumPy when it
+# is importable and every entry is a float; below it, converting lists to
+# arrays and back costs more than NumPy saves.  int and Fraction entries
+# always stay in Python, so results never depend on operand size.
+AUTO_MIN_SIZE = 4096
+
+
+def _all_float(operands):
+
+    # True if every entry of the operands (lists of rows, or vectors) is
+    # a float
+    for x in operands:
+        rows = x if x and isinstance(x[0], (list, tuple)) else (x,)
+
+        for row in rows:
+            if not all(isinstance(v, float) for v in row):
+                return False
+
+    return True
+
+
+def _store(rows, out):
+
+    # Copy computed rows into the caller's row lists, if any
+    if out is None:
+        return rows
+
+    for o, r in zip(out, rows):
+        o[:] = r
+
+    return out
+
+
+class PythonBackend:
+
+    # Dependency-free reference implementation.  Matrices are lists of
+    # rows and vectors lists; methods producing a matrix write into `out`
+    # rows when given.
+
+    name = "python"
+
+    def matmul(self, a, b, out=None, transpose_b=False, workers=None):
+
+        # With transpose_b, computes a b^T: b's rows are already the packed
+        # columns the blocked kernel wants.  Large products split across
+        # `workers` processes (linalg.parallel); workers=1 stays serial.
+        n = len(a)
+        m = len(b[0]) if transpose_b and b else len(b)
+        p = len(b) if transpose_b else (len(b[0]) if b else 0)
+
+        if parallel.use_parallel(n, m, p, workers, (a, b)):
+            if transpose_b:
+                b = [list(col) for col in zip(*b)]
+
+            return parallel.matmul(a, b, workers, out)
+
+        if transpose_b:
+            if out is not None and (out is a or out is b):
+                return _store(blocked(a, b, packed=True), out)
+
+            return blocked(a, b, packed=True, out=out)
+
+        if out is not None and (out is a or out is b):
+            return _store(matmul(a, b), out)
+
+        return matmul(a, b, out=out)
+
+    def matvec(self, a, x, transpose=False):
+
+        if not transpose:
+            return [sum(map(mul, row, x)) for row in a]
+
+        # a^T x as a combination of a's rows
+        out = [0.0] * (len(a[0]) if a else 0)
+
+        for xi, row in zip(x, a):
+            if xi:
+                out = [o + xi * r for o, r in zip(out, row)]
+
+        return out
+
+    def add(self, a, b, out=None):
+
+        if out is None:
+            return [list(map(operator.add, r, s)) for r, s in zip(a, b)]
+
+        for o, r, s in zip(out, a, b):
+            o[:] = map(operator.add, r, s)
+
+        return out
+
+    def sub(self, a, b, out=None):
+
+        if out is None:
+            return [list(map(operator.sub, r, s)) for r, s in zip(a, b)]
+
+        for o, r, s in zip(out, a, b):
+            o[:] = map(operator.sub, r, s)
+
+        return out
+
+    def scale(self, a, s, out=None):
+
+        if out is None:
+            return [[x * s for x in row] for row in a]
+
+        for o, row in zip(out, a):
+            o[:] = [x * s for x in row]
+
+        return out
+
+    def dot(self, x, y):
+        return sum(map(mul, x, y))
+
+    def norm(self, x):
+        return math.sqrt(sum(map(mul, x, x)))
+
+    def solve(self, a, b):
+
+        from linalg.lu import LU
+        from linalg.matrix import Matrix
+
+        return LU(Matrix(a)).solve(b).data
+
+    def det(self, a):
+
+        from linalg.lu import LU
+        from linalg.matrix import Matrix
+
+        return LU(Matrix(a)).det()
+
+    def inverse(self, a):
+
+        from linalg.lu import LU
+        from linalg.matrix import Matrix
+
+        return LU(Matrix(a)).inverse().data
+
+
+class ExactBackend(PythonBackend):
+
+    # Exact arithmetic for int / Fraction matrices: products accumulate
+    # without float conversion, and solve / det / inverse use Bareiss
+    # fraction-free elimination (linalg.exact).  Never chosen by "auto".
+
+    name = "exact"
+
+    def matmul(self, a, b, out=None, transpose_b=False, workers=None):
+
+        cols = b if transpose_b else [list(col) for col in zip(*b)]
+
+        return _store([[sum(map(mul, row, col)) for col in cols] for row in a], out)
+
+    def solve(self, a, b):
+
+        from linalg import exact
+        from linalg.matrix import Matrix
+
+        return exact.solve(Matrix(a), b).data
+
+    def det(self, a):
+
+        from linalg import exact
+        from linalg.matrix import Matrix
+
+        return exact.det(Matrix(a))
+
+    def inverse(self, a):
+
+        from linalg import exact
+        from linalg.matrix import Matrix
+
+        return exact.inverse(Matrix(a)).data
+
+
+class NumpyBackend:
+
+    # Same interface on float64 arrays; results come back as lists of
+    # Python floats.  Singular systems raise SingularMatrixError, as in
+    # the Python backend.
+
+    name = "numpy"
+
+    def matmul(self, a, b, out=None, transpose_b=False, workers=None):
+
+        # NumPy's BLAS has its own threads; `workers` is ignored
+        b = np.asarray(b, float)
+
+        return _store((np.asarray(a, float) @ (b.T if transpose_b else b)).tolist(), out)
+
+    def matvec(self, a, x, transpose=False):
+
+        a = np.asarray(a, float)
+
+        return ((a.T if transpose else a) @ np.asarray(x, float)).tolist()
+
+    def add(self, a, b, out=None):
+        return _store((np.asarray(a, float) + np.asarray(b, float)).tolist(), out)
+
+    def sub(self, a, b, out=None):
+        return _store((np.asarray(a, float) - np.asarray(b, float)).tolist(), out)
+
+    def scale(self, a, s, out=None):
+        return _store((np.asarray(a, float) * s).tolist(), out)
+
+    def dot(self, x, y):
+        return float(np.dot(np.asarray(x, float), np.asarray(y, float)))
+
+    def norm(self, x):
+        return float(np.linalg.norm(np.asarray(x, float)))
+
+    def _linalg(self, fn, *args):
+
+        from linalg.matrix import SingularMatrixError
+
+        try:
+            return fn(*args)
+        except np.linalg.LinAlgError as e:
+            raise SingularMatrixError("Matrix is singular") from e
+
+    def solve(self, a, b):
+        return self._linalg(np.linalg.solve, np.asarray(a, float), np.asarray(b, float)).tolist()
+
+    def det(self, a):
+        return float(np.linalg.det(np.asarray(a, float)))
+
+    def inverse(self, a):
+        return self._linalg(np.linalg.inv, np.asarray(a, float)).tolist()
+
+
+BACKENDS = {"python": PythonBackend(), "exact": ExactBackend()}
+
+if np is not None:
+    BACKENDS["numpy"] = NumpyBackend()
+
+
+_default = os.environ.get("LINALG_BACKEND", "auto")
+
+
+def _lookup(name):
+
+    if name == "auto" or not isinstance(name, str):
+        return name
+
+    if name not in BACKENDS:
+        if name == "numpy":
+            raise ImportError("NumPy backend needs numpy installed")
+
+        raise ValueError("Unknown backend: %s" % name)
+
+    return BACKENDS[name]
+
+
+def set_backend(name):
+
+    # Global default: "python", "numpy", "exact", "auto" or a backend
+    # object
+    global _default
+
+    _lookup(name)
+    _default = name
+
+
+def get_backend(name=None, size=0, operands=()):
+
+    # Backend for one call: `name` if given, else the global default;
+    # "auto" picks NumPy for operations on `size` >= AUTO_MIN_SIZE elements
+    # when all entries of `operands` are floats
+    backend = _lookup(_default if name is None else name)
+
+    if backend == "auto":
+        if "numpy" in BACKENDS and size >= AUTO_MIN_SIZE and _all_float(operands):
+            return BACKENDS["numpy"]
+
+        return BACKENDS["python"]
+
+    return backend
+
+
+@contextmanager
+def using(name):
+
+    # Temporarily change the global default
+    global _default
+
+    _lookup(name)
+    previous = _default
+    _default = name
+
+    try:
+        yield get_backend()
+    finally:
+        _default = previous
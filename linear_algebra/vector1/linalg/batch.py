@@ -0,0 +1,147 @@
+import math
+import operator
+from array import array
+from functools import partial, reduce
+from numbers import Number
+from operator import mul
+
+from linalg.vector import Vector, DimensionMismatchError
+
+
+class VectorBatch:
+
+    # N vectors of one dimension, stored column-wise: columns[c] holds
+    # component c of every vector as a flat array('d').  Operations run
+    # one map() per component instead of one method call per vector.
+    #
+    # The other operand of add / sub / dot / cross may be a batch of the
+    # same size, or a single Vector broadcast against every vector.
+
+    def __init__(self, columns):
+
+        self.columns = [array("d", col) for col in columns]
+        self.dim = len(self.columns)
+        self.n = len(self.columns[0]) if self.columns else 0
+
+        if any(len(col) != self.n for col in self.columns):
+            raise ValueError("Columns must all have the same length")
+
+    @classmethod
+    def zeros(cls, n, dim):
+        return cls([array("d", [0.0]) * n for _ in range(dim)])
+
+    @classmethod
+    def from_rows(cls, rows, dim=None):
+
+        # From an iterable of same-length sequences
+        rows = list(rows)
+        dim = len(rows[0]) if rows else (dim or 0)
+
+        if any(len(r) != dim for r in rows):
+            raise DimensionMismatchError("Vectors must have same dimension")
+
+        return cls(zip(*rows) if rows else [()] * dim)
+
+    @classmethod
+    def from_vectors(cls, vectors, dim=None):
+        return cls.from_rows((v.data for v in vectors), dim)
+
+    def rows(self):
+        return [list(r) for r in zip(*self.columns)]
+
+    def to_vectors(self):
+        return [Vector(r) for r in self.rows()]
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, k):
+        return Vector([col[k] for col in self.columns])
+
+    def _pair(self, other, op):
+
+        # Apply `op` componentwise against a batch or a broadcast Vector
+        if isinstance(other, Vector):
+
+            if other.n != self.dim:
+                raise DimensionMismatchError("Vectors must have same dimension")
+
+            return [
+                map(op, col, [c] * self.n)
+                for col, c in zip(self.columns, other.data)
+            ]
+
+        if other.dim != self.dim or other.n != self.n:
+            raise DimensionMismatchError("Batches must have same size and dimension")
+
+        return [map(op, a, b) for a, b in zip(self.columns, other.columns)]
+
+    def add(self, other):
+        return VectorBatch(self._pair(other, operator.add))
+
+    def sub(self, other):
+        return VectorBatch(self._pair(other, operator.sub))
+
+    def scalar_multiply(self, scalar):
+
+        # By one scalar, or by one scalar per vector
+        if isinstance(scalar, Number):
+            return VectorBatch(map(partial(mul, scalar), col) for col in self.columns)
+
+        if len(scalar) != self.n:
+            raise DimensionMismatchError("Need one scalar per vector")
+
+        return VectorBatch(map(mul, col, scalar) for col in self.columns)
+
+    def dot(self, other):
+
+        # array('d') of n dot products
+        terms = self._pair(other, mul)
+
+        if not terms:
+            return array("d", [0.0]) * self.n
+
+        return array("d", reduce(partial(map, operator.add), terms))
+
+    def cross(self, other):
+
+        if self.dim != 3:
+            raise ValueError("Cross product only defined for 3D vectors")
+
+        if isinstance(other, Vector):
+
+            if other.n != 3:
+                raise ValueError("Cross product only defined for 3D vectors")
+
+            bx, by, bz = ([c] * self.n for c in other.data)
+
+        else:
+
+            if other.dim != 3 or other.n != self.n:
+                raise DimensionMismatchError("Batches must have same size and dimension")
+
+            bx, by, bz = other.columns
+
+        ax, ay, az = self.columns
+
+        def det2(p, q, r, s):
+            return map(operator.sub, map(mul, p, q), map(mul, r, s))
+
+        return VectorBatch([
+            det2(ay, bz, az, by),
+            det2(az, bx, ax, bz),
+            det2(ax, by, ay, bx),
+        ])
+
+    def norm(self):
+
+        if not self.columns:
+            return array("d", [0.0]) * self.n
+
+        return array("d", map(math.hypot, *self.columns))
+
+    def normalize(self):
+
+        # Unit vectors; zero vectors stay zero
+        inv = [1.0 / x if x else 0.0 for x in self.norm()]
+        return self.scalar_multiply(inv)
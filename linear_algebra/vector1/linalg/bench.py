@@ -0,0 +1,457 @@
+"""
+Linear algebra benchmarks.
+
+Run from linear_algebra/vector1:
+
+    python -m linalg.bench multiply
+    python -m linalg.bench multiply --sizes 64 256 --json out.json
+    python -m linalg.bench multiply --threshold 0      # blocked kernel only
+    python -m linalg.bench fast --count 100000
+    python -m linalg.bench exact --sizes 10 20 30 40
+    python -m linalg.bench parallel --sizes 256 512 --workers 2 4
+
+`multiply` times the original triple-loop Matrix.multiply against the
+packed/blocked engine with and without Strassen, on seeded random square
+matrices, and checks the results agree.
+
+`fast` times dot, cross, norm and transform-point on Vector3 / Matrix4
+against the generic Vector / Matrix, over the same random inputs.
+
+`exact` solves seeded random integer systems exactly, with Gaussian
+elimination on Fraction against Bareiss fraction-free elimination, and
+checks the solutions are identical.
+
+`parallel` times the serial engine against the shared-memory process pool
+(linalg.parallel) at each worker count; the pool is started before timing.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from fractions import Fraction
+
+from linalg import exact, multiply, parallel
+from linalg.fast import Matrix4, Vector3
+from linalg.matrix import Matrix
+from linalg.vector import Vector
+
+
+SIZES = [64, 128, 256, 512, 1024]
+
+
+def naive_multiply(a, b):
+
+    # Matrix.multiply before the multiply engine, kept as the baseline
+    result = []
+
+    for i in range(a.rows):
+
+        row = []
+
+        for j in range(b.cols):
+
+            value = sum(
+                a.data[i][k] * b.data[k][j]
+                for k in range(a.cols)
+            )
+
+            row.append(value)
+
+        result.append(row)
+
+    return Matrix(result)
+
+
+def random_matrix(n, rng):
+    return Matrix([[rng.uniform(-1, 1) for _ in range(n)] for _ in range(n)])
+
+
+def timed(fn, min_time=0.2):
+
+    # Best of repeated runs, repeating until `min_time` has passed
+    best = None
+    total = 0.0
+
+    while total < min_time or best is None:
+        t = time.perf_counter()
+        out = fn()
+        t = time.perf_counter() - t
+
+        total += t
+        best = t if best is None else min(best, t)
+
+    return best, out
+
+
+def max_error(x, y):
+    return max(abs(p - q) for r, s in zip(x.data, y.data) for p, q in zip(r, s))
+
+
+def bench_multiply(sizes, seed=0, threshold=None, block=None, baseline_max=None):
+
+    results = []
+
+    for n in sizes:
+        rng = random.Random(seed)
+        a = random_matrix(n, rng)
+        b = random_matrix(n, rng)
+
+        t_blocked, c_blocked = timed(
+            lambda: Matrix(multiply.matmul(a.data, b.data, block, threshold=0))
+        )
+        t_engine, c_engine = timed(
+            lambda: Matrix(multiply.matmul(a.data, b.data, block, threshold))
+        )
+
+        result = {
+            "size": n,
+            "s_blocked": t_blocked,
+            "s_engine": t_engine,
+        }
+
+        if baseline_max is None or n <= baseline_max:
+            t_naive, c_naive = timed(lambda: naive_multiply(a, b))
+
+            result["s_naive"] = t_naive
+            result["speedup"] = t_naive / t_engine
+            result["max_error"] = max(
+                max_error(c_naive, c_blocked),
+                max_error(c_naive, c_engine)
+            )
+
+        results.append(result)
+
+    return results
+
+
+def bench_fast(count, seed=0):
+
+    rng = random.Random(seed)
+
+    points = [[rng.uniform(-10, 10) for _ in range(3)] for _ in range(count)]
+    others = [[rng.uniform(-10, 10) for _ in range(3)] for _ in range(count)]
+
+    generic = [Vector(p) for p in points]
+    generic_b = [Vector(p) for p in others]
+    fast = [Vector3(*p) for p in points]
+    fast_b = [Vector3(*p) for p in others]
+
+    transform = (
+        Matrix4.translation(1.0, 2.0, 3.0)
+        .multiply(Matrix4.rotation_y(0.3))
+        .multiply(Matrix4.rotation_x(-0.4))
+    )
+    transform_generic = transform.to_matrix()
+    homogeneous = [Vector(p + [1.0]) for p in points]
+
+    def transform_all():
+        for v in homogeneous:
+            x, y, z, w = transform_generic.multiply(v).data
+            Vector([x / w, y / w, z / w])
+
+    cases = [
+        ("dot",
+         lambda: [a.dot(b) for a, b in zip(generic, generic_b)],
+         lambda: [a.dot(b) for a, b in zip(fast, fast_b)]),
+        ("cross",
+         lambda: [a.cross(b) for a, b in zip(generic, generic_b)],
+         lambda: [a.cross(b) for a, b in zip(fast, fast_b)]),
+        ("norm",
+         lambda: [a.norm() for a in generic],
+         lambda: [a.norm() for a in fast]),
+        ("transform_point",
+         transform_all,
+         lambda: [transform.transform_point(a) for a in fast]),
+    ]
+
+    results = []
+
+    for name, slow_fn, fast_fn in cases:
+        t_generic, _ = timed(slow_fn)
+        t_fast, _ = timed(fast_fn)
+
+        results.append({
+            "op": name,
+            "count": count,
+            "ns_generic": t_generic / count * 1e9,
+            "ns_fast": t_fast / count * 1e9,
+            "speedup": t_generic / t_fast,
+        })
+
+    return results
+
+
+def fraction_solve(a, b):
+
+    # Textbook Gaussian elimination and back substitution on Fraction
+    n = len(a)
+    rows = [[Fraction(x) for x in row] + [Fraction(v)] for row, v in zip(a, b)]
+
+    for c in range(n):
+
+        p = next(i for i in range(c, n) if rows[i][c])
+        rows[c], rows[p] = rows[p], rows[c]
+
+        pivot = rows[c]
+
+        for i in range(c + 1, n):
+            f = rows[i][c] / pivot[c]
+
+            if f:
+                rows[i] = [x - f * y for x, y in zip(rows[i], pivot)]
+
+    x = [Fraction(0)] * n
+
+    for i in reversed(range(n)):
+        row = rows[i]
+        x[i] = (row[n] - sum(row[j] * x[j] for j in range(i + 1, n))) / row[i]
+
+    return x
+
+
+def bench_exact(sizes, seed=0, entries=9):
+
+    results = []
+
+    for n in sizes:
+        rng = random.Random(seed)
+        a = [[rng.randint(-entries, entries) for _ in range(n)] for _ in range(n)]
+        b = [rng.randint(-entries, entries) for _ in range(n)]
+
+        m = Matrix(a)
+
+        t_fraction, x_fraction = timed(lambda: fraction_solve(a, b))
+        t_bareiss, x_bareiss = timed(lambda: exact.solve(m, b).data)
+
+        results.append({
+            "size": n,
+            "s_fraction": t_fraction,
+            "s_bareiss": t_bareiss,
+            "speedup": t_fraction / t_bareiss,
+            "denominator_bits": max(Fraction(x).denominator.bit_length() for x in x_bareiss),
+            "agree": x_fraction == x_bareiss,
+        })
+
+    return results
+
+
+def bench_parallel(sizes, workers, seed=0):
+
+    results = []
+
+    for n in sizes:
+        rng = random.Random(seed)
+        a = random_matrix(n, rng)
+        b = random_matrix(n, rng)
+
+        t_serial, c_serial = timed(lambda: multiply.matmul(a.data, b.data))
+
+        for w in workers:
+            parallel.matmul([[1.0]], [[1.0]], w)
+
+            t_parallel, c_parallel = timed(lambda: parallel.matmul(a.data, b.data, w))
+
+            results.append({
+                "size": n,
+                "workers": w,
+                "s_serial": t_serial,
+                "s_parallel": t_parallel,
+                "speedup": t_serial / t_parallel,
+                "max_error": max_error(Matrix(c_serial), Matrix(c_parallel)),
+            })
+
+    parallel.shutdown()
+
+    return results
+
+
+def parallel_table(results):
+
+    head = ["size", "workers", "serial s", "parallel s", "speedup", "max err"]
+    rows = [
+        [
+            str(r["size"]),
+            str(r["workers"]),
+            "%.4f" % r["s_serial"],
+            "%.4f" % r["s_parallel"],
+            "%.2fx" % r["speedup"],
+            "%.1e" % r["max_error"],
+        ]
+        for r in results
+    ]
+
+    return render_table(head, rows)
+
+
+def exact_table(results):
+
+    head = ["size", "fraction s", "bareiss s", "speedup", "denom bits", "agree"]
+    rows = [
+        [
+            str(r["size"]),
+            "%.4f" % r["s_fraction"],
+            "%.4f" % r["s_bareiss"],
+            "%.2fx" % r["speedup"],
+            str(r["denominator_bits"]),
+            "yes" if r["agree"] else "NO",
+        ]
+        for r in results
+    ]
+
+    return render_table(head, rows)
+
+
+def render_table(head, rows):
+
+    widths = [max(len(c) for c in col) for col in zip(head, *rows)]
+
+    lines = ["  ".join(c.rjust(w) for c, w in zip(head, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+
+    for row in rows:
+        lines.append("  ".join(c.rjust(w) for c, w in zip(row, widths)))
+
+    return "\n".join(lines)
+
+
+def fast_table(results):
+
+    head = ["op", "generic ns", "fast ns", "speedup"]
+    rows = [
+        [
+            r["op"],
+            "%.0f" % r["ns_generic"],
+            "%.0f" % r["ns_fast"],
+            "%.2fx" % r["speedup"],
+        ]
+        for r in results
+    ]
+
+    return render_table(head, rows)
+
+
+def table(results):
+
+    head = ["size", "naive s", "blocked s", "engine s", "speedup", "max err"]
+    rows = []
+
+    for r in results:
+        rows.append([
+            str(r["size"]),
+            "%.4f" % r["s_naive"] if "s_naive" in r else "-",
+            "%.4f" % r["s_blocked"],
+            "%.4f" % r["s_engine"],
+            "%.2fx" % r["speedup"] if "speedup" in r else "-",
+            "%.1e" % r["max_error"] if "max_error" in r else "-",
+        ])
+
+    return render_table(head, rows)
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Linear algebra benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("multiply", help="naive vs blocked vs Strassen multiply")
+    p.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--threshold", type=int,
+                   default=multiply.STRASSEN_THRESHOLD,
+                   help="Strassen threshold (0 disables)")
+    p.add_argument("--block", type=int, default=multiply.BLOCK_SIZE)
+    p.add_argument("--baseline-max", type=int,
+                   help="skip the naive baseline above this size")
+    p.add_argument("--json", metavar="PATH",
+                   help="write results as JSON ('-' for stdout)")
+
+    p = sub.add_parser("fast", help="Vector3 / Matrix4 vs Vector / Matrix")
+    p.add_argument("--count", type=int, default=100000)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--json", metavar="PATH",
+                   help="write results as JSON ('-' for stdout)")
+
+    p = sub.add_parser("exact", help="Fraction vs Bareiss exact solves")
+    p.add_argument("--sizes", nargs="+", type=int, default=[10, 20, 30, 40, 60])
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--entries", type=int, default=9,
+                   help="integer entries drawn from [-N, N]")
+    p.add_argument("--json", metavar="PATH",
+                   help="write results as JSON ('-' for stdout)")
+
+    p = sub.add_parser("parallel", help="serial vs multiprocess multiply")
+    p.add_argument("--sizes", nargs="+", type=int, default=[256, 512])
+    p.add_argument("--workers", nargs="+", type=int, default=[parallel.WORKERS])
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--json", metavar="PATH",
+                   help="write results as JSON ('-' for stdout)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "multiply":
+        results = bench_multiply(
+            args.sizes,
+            seed=args.seed,
+            threshold=args.threshold,
+            block=args.block,
+            baseline_max=args.baseline_max
+        )
+
+        report = {
+            "command": args.command,
+            "seed": args.seed,
+            "threshold": args.threshold,
+            "block": args.block,
+            "results": results,
+        }
+        text = table(results)
+
+    elif args.command == "fast":
+        results = bench_fast(args.count, seed=args.seed)
+
+        report = {
+            "command": args.command,
+            "seed": args.seed,
+            "results": results,
+        }
+        text = fast_table(results)
+
+    elif args.command == "parallel":
+        results = bench_parallel(args.sizes, args.workers, seed=args.seed)
+
+        report = {
+            "command": args.command,
+            "seed": args.seed,
+            "cpus": os.cpu_count(),
+            "results": results,
+        }
+        text = parallel_table(results)
+
+    else:
+        results = bench_exact(args.sizes, seed=args.seed, entries=args.entries)
+
+        report = {
+            "command": args.command,
+            "seed": args.seed,
+            "entries": args.entries,
+            "results": results,
+        }
+        text = exact_table(results)
+
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return
+
+    print(text)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,494 @@
+import math
+import sys
+from operator import mul
+
+from linalg.lu import LU
+from linalg.matrix import Matrix, NotSquareMatrixError
+from linalg.vector import Vector
+
+
+EPS = sys.float_info.epsilon
+
+
+class Eigenvalues:
+
+    # All eigenvalues (complex where a conjugate pair was found), the QR
+    # iterations spent, and whether every eigenvalue deflated within
+    # `max_iter` iterations.
+
+    def __init__(self, values, iterations, converged):
+
+        self.values = values
+        self.iterations = iterations
+        self.converged = converged
+
+
+class EigenPair:
+
+    # One eigenvalue and unit eigenvector, with the iterations used and
+    # the final residual |Ax - value x|.
+
+    def __init__(self, value, vector, iterations, residual, converged):
+
+        self.value = value
+        self.vector = vector
+        self.iterations = iterations
+        self.residual = residual
+        self.converged = converged
+
+
+class SVD:
+
+    # A = U diag(S) V^T with singular values S in descending order.  U is
+    # m x k and V is n x k (k = min(m, n)).  `iterations` counts Jacobi
+    # sweeps and `rotations` the plane rotations applied.
+
+    def __init__(self, U, S, V, iterations, rotations, converged):
+
+        self.U = U
+        self.S = S
+        self.V = V
+        self.iterations = iterations
+        self.rotations = rotations
+        self.converged = converged
+
+
+def _square(m):
+
+    if m.rows != m.cols:
+        raise NotSquareMatrixError("Eigenvalues need a square matrix")
+
+    return [[float(x) for x in row] for row in m.data]
+
+
+def _hessenberg(a):
+
+    # Reduce the rows `a` in place to upper Hessenberg form by stabilized
+    # elementary similarity transforms (Gaussian elimination with
+    # pivoting).  Each step is row operations on the rows below the pivot
+    # and one dot product per row for the column update.
+    n = len(a)
+
+    for m in range(1, n - 1):
+
+        p = max(range(m, n), key=lambda i: abs(a[i][m - 1]))
+        pivot = a[p][m - 1]
+
+        if p != m:
+            a[p], a[m] = a[m], a[p]
+
+            for row in a:
+                row[p], row[m] = row[m], row[p]
+
+        if not pivot:
+            continue
+
+        prow = a[m][m - 1:]
+        ys = []
+
+        for i in range(m + 1, n):
+
+            row = a[i]
+            y = row[m - 1] / pivot
+            ys.append(y)
+
+            if y:
+                row[m - 1:] = [x - y * q for x, q in zip(row[m - 1:], prow)]
+
+        if any(ys):
+            for row in a:
+                row[m] += sum(map(mul, ys, row[m + 1:]))
+
+    return a
+
+
+def hessenberg(m):
+
+    # Upper Hessenberg matrix similar to m
+    return Matrix(_hessenberg(_square(m)))
+
+
+def _hqr(a, tol, max_iter):
+
+    # Francis double-shift QR on the upper Hessenberg rows `a`, 1-indexed
+    # through a padding row and column, deflating one or two eigenvalues
+    # at a time.  Returns (values, iterations, converged).
+    n = len(a)
+    h = [[0.0] * (n + 1)] + [[0.0] + row for row in a]
+
+    anorm = sum(abs(h[i][j]) for i in range(1, n + 1) for j in range(max(i - 1, 1), n + 1))
+
+    wr = [0.0] * (n + 1)
+    wi = [0.0] * (n + 1)
+
+    nn = n
+    t = 0.0
+    total = 0
+    converged = True
+
+    while nn >= 1:
+
+        its = 0
+
+        while True:
+
+            # Look for a negligible subdiagonal element
+            l = 1
+
+            for ll in range(nn, 1, -1):
+                s = abs(h[ll - 1][ll - 1]) + abs(h[ll][ll])
+
+                if s == 0.0:
+                    s = anorm
+
+                if abs(h[ll][ll - 1]) <= tol * s:
+                    h[ll][ll - 1] = 0.0
+                    l = ll
+                    break
+
+            x = h[nn][nn]
+
+            if l == nn:
+                # One root
+                wr[nn] = x + t
+                wi[nn] = 0.0
+                nn -= 1
+                break
+
+            y = h[nn - 1][nn - 1]
+            w = h[nn][nn - 1] * h[nn - 1][nn]
+
+            if l == nn - 1:
+                # Two roots
+                p = 0.5 * (y - x)
+                q = p * p + w
+                z = math.sqrt(abs(q))
+                x += t
+
+                if q >= 0.0:
+                    z = p + math.copysign(z, p)
+                    wr[nn - 1] = wr[nn] = x + z
+
+                    if z:
+                        wr[nn] = x - w / z
+
+                    wi[nn - 1] = wi[nn] = 0.0
+                else:
+                    wr[nn - 1] = wr[nn] = x + p
+                    wi[nn - 1] = -z
+                    wi[nn] = z
+
+                nn -= 2
+                break
+
+            if its == max_iter:
+                # Out of budget: report the remaining diagonal as is
+                converged = False
+
+                for i in range(1, nn + 1):
+                    wr[i] = h[i][i] + t
+                    wi[i] = 0.0
+
+                nn = 0
+                break
+
+            if its == 10 or its == 20:
+                # Exceptional shift
+                t += x
+
+                for i in range(1, nn + 1):
+                    h[i][i] -= x
+
+                s = abs(h[nn][nn - 1]) + abs(h[nn - 1][nn - 2])
+                y = x = 0.75 * s
+                w = -0.4375 * s * s
+
+            its += 1
+            total += 1
+
+            # Two consecutive small subdiagonal elements
+            m = nn - 2
+
+            while m >= l:
+                z = h[m][m]
+                r = x - z
+                s = y - z
+                p = (r * s - w) / h[m + 1][m] + h[m][m + 1]
+                q = h[m + 1][m + 1] - z - r - s
+                r = h[m + 2][m + 1]
+                s = abs(p) + abs(q) + abs(r)
+                p /= s
+                q /= s
+                r /= s
+
+                if m == l:
+                    break
+
+                u = abs(h[m][m - 1]) * (abs(q) + abs(r))
+                v = abs(p) * (abs(h[m - 1][m - 1]) + abs(z) + abs(h[m + 1][m + 1]))
+
+                if u <= tol * v:
+                    break
+
+                m -= 1
+
+            for i in range(m + 2, nn + 1):
+                h[i][i - 2] = 0.0
+
+                if i != m + 2:
+                    h[i][i - 3] = 0.0
+
+            # Double QR step on rows l..nn and columns m..nn
+            for k in range(m, nn):
+
+                if k != m:
+                    p = h[k][k - 1]
+                    q = h[k + 1][k - 1]
+                    r = h[k + 2][k - 1] if k != nn - 1 else 0.0
+                    x = abs(p) + abs(q) + abs(r)
+
+                    if x != 0.0:
+                        p /= x
+                        q /= x
+                        r /= x
+
+                s = math.copysign(math.sqrt(p * p + q * q + r * r), p)
+
+                if s == 0.0:
+                    continue
+
+                if k == m:
+                    if l != m:
+                        h[k][k - 1] = -h[k][k - 1]
+                else:
+                    h[k][k - 1] = -s * x
+
+                p += s
+                x = p / s
+                y = q / s
+                z = r / s
+                q /= p
+                r /= p
+
+                last = k != nn - 1
+                hk = h[k]
+                hk1 = h[k + 1]
+                hk2 = h[k + 2] if last else None
+
+                for j in range(k, nn + 1):
+                    p = hk[j] + q * hk1[j]
+
+                    if last:
+                        p += r * hk2[j]
+                        hk2[j] -= p * z
+
+                    hk1[j] -= p * y
+                    hk[j] -= p * x
+
+                for i in range(l, min(nn, k + 3) + 1):
+                    hi = h[i]
+                    p = x * hi[k] + y * hi[k + 1]
+
+                    if last:
+                        p += z * hi[k + 2]
+                        hi[k + 2] -= p * r
+
+                    hi[k + 1] -= p * q
+                    hi[k] -= p
+
+    values = [
+        complex(wr[i], wi[i]) if wi[i] else wr[i]
+        for i in range(1, n + 1)
+    ]
+
+    return values, total, converged
+
+
+def eigenvalues(m, tol=EPS, max_iter=30):
+
+    # Hessenberg reduction, then shifted QR.  `tol` is the relative size
+    # below which a subdiagonal element counts as zero; `max_iter` bounds
+    # the QR iterations spent on each eigenvalue.  Values are sorted by
+    # descending magnitude.
+    a = _hessenberg(_square(m))
+
+    if not a:
+        return Eigenvalues([], 0, True)
+
+    values, iterations, converged = _hqr(a, tol, max_iter)
+    values.sort(key=lambda v: (-abs(v), -v.real, -v.imag))
+
+    return Eigenvalues(values, iterations, converged)
+
+
+def _norm(x):
+    return math.sqrt(sum(map(mul, x, x)))
+
+
+def _start(n, x0):
+
+    if x0 is not None:
+        x = list(x0.data if isinstance(x0, Vector) else x0)
+    else:
+        # Not orthogonal to any eigenvector in practice
+        x = [1.0 + 0.1 * math.sin(i + 1.0) for i in range(n)]
+
+    s = _norm(x)
+
+    if not s:
+        raise ValueError("Start vector must be nonzero")
+
+    return [v / s for v in x]
+
+
+def _pair(a, x, k, tol, max_iter, step):
+
+    # Shared loop for power / inverse iteration: `step` maps the unit
+    # vector x to the next (unnormalized) iterate
+    value = 0.0
+    residual = math.inf
+
+    while True:
+
+        ax = [sum(map(mul, row, x)) for row in a]
+        value = sum(map(mul, x, ax))
+        residual = _norm([p - value * q for p, q in zip(ax, x)])
+
+        if residual <= tol * max(abs(value), EPS) or k >= max_iter:
+            break
+
+        y = step(x, ax)
+        s = _norm(y)
+
+        if not s:
+            break
+
+        x = [v / s for v in y]
+        k += 1
+
+    return EigenPair(value, Vector(x), k, residual, residual <= tol * max(abs(value), EPS))
+
+
+def power_iteration(m, tol=1e-10, max_iter=1000, x0=None):
+
+    # Dominant eigenpair (largest |value|) by repeated multiplication.
+    # Converged once |Ax - value x| <= tol |value|.
+    a = _square(m)
+    x = _start(len(a), x0)
+
+    return _pair(a, x, 0, tol, max_iter, lambda x, ax: ax)
+
+
+def inverse_iteration(m, shift=0.0, tol=1e-10, max_iter=100, x0=None):
+
+    # Eigenpair with value nearest `shift`: power iteration on
+    # (A - shift I)^-1, factored once and reused every iteration
+    a = _square(m)
+    n = len(a)
+
+    shifted = [
+        [v - shift if i == j else v for j, v in enumerate(row)]
+        for i, row in enumerate(a)
+    ]
+
+    lu = LU(Matrix(shifted))
+
+    if lu.singular:
+        # The shift is an eigenvalue; nudge it off
+        scale = max((abs(v) for row in a for v in row), default=1.0) or 1.0
+
+        for i in range(n):
+            shifted[i][i] -= scale * 1e-10
+
+        lu = LU(Matrix(shifted))
+
+    x = _start(n, x0)
+
+    return _pair(a, x, 0, tol, max_iter, lambda x, ax: lu._solve(x))
+
+
+def svd(m, tol=1e-12, max_iter=60):
+
+    # One-sided Jacobi (Hestenes): rotate pairs of columns of A until all
+    # are mutually orthogonal to within `tol` (|ui . uj| <= tol |ui| |uj|),
+    # at most `max_iter` sweeps.  The column norms are then the singular
+    # values.  Wide matrices are handled through their transpose.
+    rows = [[float(x) for x in row] for row in m.data]
+    wide = m.rows < m.cols
+
+    if wide:
+        rows = [list(col) for col in zip(*rows)]
+
+    r = len(rows)
+    c = len(rows[0]) if rows else 0
+
+    u = [list(col) for col in zip(*rows)]
+    v = [[1.0 if i == j else 0.0 for i in range(c)] for j in range(c)]
+    norms = [sum(map(mul, col, col)) for col in u]
+
+    sweeps = 0
+    rotations = 0
+    converged = c < 2
+
+    while not converged and sweeps < max_iter:
+
+        sweeps += 1
+        rotated = False
+
+        for i in range(c - 1):
+            for j in range(i + 1, c):
+
+                alpha = norms[i]
+                beta = norms[j]
+                gamma = sum(map(mul, u[i], u[j]))
+
+                if abs(gamma) <= tol * math.sqrt(alpha * beta) or not gamma:
+                    continue
+
+                zeta = (beta - alpha) / (2.0 * gamma)
+                t = math.copysign(1.0, zeta) / (abs(zeta) + math.sqrt(1.0 + zeta * zeta))
+                cs = 1.0 / math.sqrt(1.0 + t * t)
+                sn = cs * t
+
+                ui = u[i]
+                uj = u[j]
+                u[i] = [cs * p - sn * q for p, q in zip(ui, uj)]
+                u[j] = [sn * p + cs * q for p, q in zip(ui, uj)]
+
+                vi = v[i]
+                vj = v[j]
+                v[i] = [cs * p - sn * q for p, q in zip(vi, vj)]
+                v[j] = [sn * p + cs * q for p, q in zip(vi, vj)]
+
+                norms[i] = max(alpha - t * gamma, 0.0)
+                norms[j] = max(beta + t * gamma, 0.0)
+
+                rotations += 1
+                rotated = True
+
+        if not rotated:
+            converged = True
+        else:
+            # Refresh the running norms against rounding drift
+            norms = [sum(map(mul, col, col)) for col in u]
+
+    sigma = [_norm(col) for col in u]
+    order = sorted(range(c), key=lambda k: -sigma[k])
+    k = min(r, c)
+    order = order[:k]
+
+    S = [sigma[j] for j in order]
+    U = [
+        [x / sigma[j] for x in u[j]] if sigma[j] else [0.0] * r
+        for j in order
+    ]
+    V = [v[j] for j in order]
+
+    # Columns to row-major matrices
+    U = Matrix([list(row) for row in zip(*U)]) if U else Matrix([])
+    V = Matrix([list(row) for row in zip(*V)]) if V else Matrix([])
+
+    if wide:
+        U, V = V, U
+
+    return SVD(U, S, V, sweeps, rotations, converged)
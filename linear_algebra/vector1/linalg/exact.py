@@ -0,0 +1,184 @@
+from fractions import Fraction
+from math import lcm
+
+from linalg.matrix import Matrix, NotSquareMatrixError, SingularMatrixError
+from linalg.vector import Vector, DimensionMismatchError
+
+
+# Exact determinant, rank, solve and inverse by Bareiss fraction-free
+# elimination.
+#
+# Entries may be int, Fraction or float (floats are taken at their exact
+# binary value).  Each row is scaled to integers first; every elimination
+# step then divides exactly by the previous pivot, so intermediates stay
+# minors of the input, bounded polynomially in size, and no gcd is ever
+# taken.  Results are ints where integral, Fractions otherwise.
+
+
+def _exact(q):
+    return q.numerator if q.denominator == 1 else q
+
+
+def _integer_rows(rows):
+
+    # Rows scaled to integers, and the scale of each row
+    out = []
+    scales = []
+
+    for row in rows:
+
+        row = [x if isinstance(x, int) else Fraction(x) for x in row]
+        scale = lcm(*(x.denominator for x in row if isinstance(x, Fraction)), 1)
+
+        out.append([int(x * scale) for x in row])
+        scales.append(scale)
+
+    return out, scales
+
+
+def _forward(a, cols):
+
+    # Bareiss elimination below the pivots over the first `cols`
+    # columns, in place.  Returns (rank, sign of the row permutation).
+    n = len(a)
+    prev = 1
+    r = 0
+    sign = 1
+
+    for c in range(cols):
+
+        if r == n:
+            break
+
+        p = next((i for i in range(r, n) if a[i][c]), None)
+
+        if p is None:
+            continue
+
+        if p != r:
+            a[p], a[r] = a[r], a[p]
+            sign = -sign
+
+        prow = a[r][c:]
+        piv = prow[0]
+
+        for i in range(r + 1, n):
+
+            row = a[i]
+            f = row[c]
+
+            if f:
+                row[c:] = [(piv * x - f * y) // prev for x, y in zip(row[c:], prow)]
+            elif piv != prev:
+                row[c:] = [piv * x // prev for x in row[c:]]
+
+        prev = piv
+        r += 1
+
+    return r, sign
+
+
+def _gauss_jordan(a, n):
+
+    # Fraction-free Gauss-Jordan on the augmented rows `a` (n x (n + k)):
+    # afterwards a[i][i] is the (scaled) determinant d for every i and
+    # the augmented block holds d * A^-1 B
+    prev = 1
+
+    for c in range(n):
+
+        p = next((i for i in range(c, n) if a[i][c]), None)
+
+        if p is None:
+            raise SingularMatrixError("Matrix is singular")
+
+        if p != c:
+            a[p], a[c] = a[c], a[p]
+
+        prow = a[c]
+        piv = prow[c]
+
+        for i in range(n):
+
+            if i == c:
+                continue
+
+            row = a[i]
+            f = row[c]
+            row[:] = [(piv * x - f * y) // prev for x, y in zip(row, prow)]
+
+        prev = piv
+
+    return a
+
+
+def _square(m):
+
+    if m.rows != m.cols:
+        raise NotSquareMatrixError("Matrix must be square")
+
+    return m.data
+
+
+def det(m):
+
+    rows = _square(m)
+    n = len(rows)
+
+    if not n:
+        return 1
+
+    a, scales = _integer_rows(rows)
+    rank, sign = _forward(a, n)
+
+    if rank < n:
+        return 0
+
+    scale = 1
+
+    for s in scales:
+        scale *= s
+
+    return _exact(Fraction(sign * a[-1][-1], scale))
+
+
+def rank(m):
+
+    a, _ = _integer_rows(m.data)
+    return _forward(a, m.cols)[0]
+
+
+def solve(m, b):
+
+    # Exact x with Ax = b, for a Vector or list b
+    rows = _square(m)
+    n = len(rows)
+
+    data = b.data if isinstance(b, Vector) else b
+
+    if len(data) != n:
+        raise DimensionMismatchError("Right-hand side must have %d entries" % n)
+
+    a, _ = _integer_rows([list(row) + [v] for row, v in zip(rows, data)])
+    _gauss_jordan(a, n)
+
+    return Vector([_exact(Fraction(row[n], row[i])) for i, row in enumerate(a)])
+
+
+def inverse(m):
+
+    rows = _square(m)
+    n = len(rows)
+
+    # Scaling rows of [A | I] by D solves (DA) X = D, still X = A^-1
+    a, _ = _integer_rows([
+        list(row) + [1 if i == j else 0 for j in range(n)]
+        for i, row in enumerate(rows)
+    ])
+
+    _gauss_jordan(a, n)
+
+    return Matrix([
+        [_exact(Fraction(x, row[i])) for x in row[n:]]
+        for i, row in enumerate(a)
+    ])
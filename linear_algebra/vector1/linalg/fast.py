@@ -0,0 +1,383 @@
+import math
+from numbers import Number
+
+from linalg.matrix import Matrix
+from linalg.vector import Vector, DimensionMismatchError
+
+
+class Vector3:
+
+    # 3D vector with unrolled arithmetic and no per-instance dict.
+    #
+    # Exposes `data` and `n` like Vector, so it can be passed wherever a
+    # Vector is read (Camera.project, Vector.add, ...), and accepts
+    # 3-dimensional Vectors as operands.  `data` is a fresh list, so a
+    # Vector3 cannot be a Vector method's `out`.
+
+    __slots__ = ("x", "y", "z")
+
+    n = 3
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+
+        self.x = x
+        self.y = y
+        self.z = z
+
+    @classmethod
+    def from_vector(cls, v):
+
+        x, y, z = v.data
+        return cls(x, y, z)
+
+    def to_vector(self):
+        return Vector([self.x, self.y, self.z])
+
+    @property
+    def data(self):
+        return [self.x, self.y, self.z]
+
+    def __iter__(self):
+        yield self.x
+        yield self.y
+        yield self.z
+
+    def __repr__(self):
+        return "Vector3(%r, %r, %r)" % (self.x, self.y, self.z)
+
+    def __eq__(self, v):
+
+        if not isinstance(v, Vector3):
+            return NotImplemented
+
+        return self.x == v.x and self.y == v.y and self.z == v.z
+
+    def add(self, v):
+
+        bx, by, bz = (v.x, v.y, v.z) if type(v) is Vector3 else _xyz(v)
+        return Vector3(self.x + bx, self.y + by, self.z + bz)
+
+    def sub(self, v):
+
+        bx, by, bz = (v.x, v.y, v.z) if type(v) is Vector3 else _xyz(v)
+        return Vector3(self.x - bx, self.y - by, self.z - bz)
+
+    def scalar_multiply(self, s):
+        return Vector3(self.x * s, self.y * s, self.z * s)
+
+    def dot(self, v):
+
+        if type(v) is Vector3:
+            return self.x * v.x + self.y * v.y + self.z * v.z
+
+        bx, by, bz = _xyz(v)
+        return self.x * bx + self.y * by + self.z * bz
+
+    def cross(self, v):
+
+        ax, ay, az = self.x, self.y, self.z
+        bx, by, bz = (v.x, v.y, v.z) if type(v) is Vector3 else _xyz(v)
+
+        return Vector3(ay*bz - az*by, az*bx - ax*bz, ax*by - ay*bx)
+
+    def norm(self):
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def normalize(self):
+
+        n = self.norm()
+
+        if not n:
+            raise ZeroDivisionError("Cannot normalize a zero vector")
+
+        return Vector3(self.x / n, self.y / n, self.z / n)
+
+    def __add__(self, v):
+        return self.add(v) if isinstance(v, (Vector3, Vector)) else NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, v):
+        return self.sub(v) if isinstance(v, (Vector3, Vector)) else NotImplemented
+
+    def __rsub__(self, v):
+        return Vector3.from_vector(v).sub(self) if isinstance(v, Vector) else NotImplemented
+
+    def __mul__(self, s):
+        return Vector3(self.x * s, self.y * s, self.z * s) if isinstance(s, Number) else NotImplemented
+
+    __rmul__ = __mul__
+
+    def __matmul__(self, v):
+        return self.dot(v) if isinstance(v, (Vector3, Vector)) else NotImplemented
+
+    __rmatmul__ = __matmul__
+
+    def __neg__(self):
+        return Vector3(-self.x, -self.y, -self.z)
+
+    def __iadd__(self, v):
+
+        if not isinstance(v, (Vector3, Vector)):
+            return NotImplemented
+
+        bx, by, bz = _xyz(v)
+
+        self.x += bx
+        self.y += by
+        self.z += bz
+
+        return self
+
+    def __isub__(self, v):
+
+        if not isinstance(v, (Vector3, Vector)):
+            return NotImplemented
+
+        bx, by, bz = _xyz(v)
+
+        self.x -= bx
+        self.y -= by
+        self.z -= bz
+
+        return self
+
+    def __imul__(self, s):
+
+        if not isinstance(s, Number):
+            return NotImplemented
+
+        self.x *= s
+        self.y *= s
+        self.z *= s
+
+        return self
+
+
+def _xyz(v):
+
+    # Components of a Vector3, or of anything with a 3-entry `data`
+    if isinstance(v, Vector3):
+        return v.x, v.y, v.z
+
+    if len(v.data) != 3:
+        raise DimensionMismatchError("Vectors must have same dimension")
+
+    return v.data
+
+
+class Matrix4:
+
+    # 4x4 homogeneous transform as a flat, row-major 16-tuple.  Products
+    # and point transforms are fully unrolled.  `rows`, `cols` and `data`
+    # match Matrix; products take a 4x4 Matrix on either side, and @ maps
+    # a 3-dimensional Vector as a point.
+
+    __slots__ = ("m",)
+
+    rows = 4
+    cols = 4
+
+    def __init__(self, m):
+
+        m = tuple(m)
+
+        if len(m) != 16:
+            raise ValueError("Matrix4 needs 16 values")
+
+        self.m = m
+
+    @classmethod
+    def from_rows(cls, rows):
+        return cls(x for row in rows for x in row)
+
+    @classmethod
+    def from_matrix(cls, m):
+
+        if m.rows != 4 or m.cols != 4:
+            raise ValueError("Matrix4 needs a 4x4 matrix")
+
+        return cls.from_rows(m.data)
+
+    def to_matrix(self):
+        return Matrix(self.data)
+
+    @property
+    def data(self):
+        m = self.m
+        return [list(m[0:4]), list(m[4:8]), list(m[8:12]), list(m[12:16])]
+
+    def __repr__(self):
+        return "Matrix4(%r)" % (self.m,)
+
+    def __eq__(self, other):
+
+        if not isinstance(other, Matrix4):
+            return NotImplemented
+
+        return self.m == other.m
+
+    @classmethod
+    def identity(cls):
+        return cls((1.0, 0.0, 0.0, 0.0,
+                    0.0, 1.0, 0.0, 0.0,
+                    0.0, 0.0, 1.0, 0.0,
+                    0.0, 0.0, 0.0, 1.0))
+
+    @classmethod
+    def translation(cls, x, y, z):
+        return cls((1.0, 0.0, 0.0, x,
+                    0.0, 1.0, 0.0, y,
+                    0.0, 0.0, 1.0, z,
+                    0.0, 0.0, 0.0, 1.0))
+
+    @classmethod
+    def scaling(cls, x, y, z):
+        return cls((x, 0.0, 0.0, 0.0,
+                    0.0, y, 0.0, 0.0,
+                    0.0, 0.0, z, 0.0,
+                    0.0, 0.0, 0.0, 1.0))
+
+    @classmethod
+    def rotation_x(cls, angle):
+
+        c = math.cos(angle)
+        s = math.sin(angle)
+
+        return cls((1.0, 0.0, 0.0, 0.0,
+                    0.0, c, -s, 0.0,
+                    0.0, s, c, 0.0,
+                    0.0, 0.0, 0.0, 1.0))
+
+    @classmethod
+    def rotation_y(cls, angle):
+
+        c = math.cos(angle)
+        s = math.sin(angle)
+
+        return cls((c, 0.0, s, 0.0,
+                    0.0, 1.0, 0.0, 0.0,
+                    -s, 0.0, c, 0.0,
+                    0.0, 0.0, 0.0, 1.0))
+
+    @classmethod
+    def rotation_z(cls, angle):
+
+        c = math.cos(angle)
+        s = math.sin(angle)
+
+        return cls((c, -s, 0.0, 0.0,
+                    s, c, 0.0, 0.0,
+                    0.0, 0.0, 1.0, 0.0,
+                    0.0, 0.0, 0.0, 1.0))
+
+    def multiply(self, other):
+
+        # self * other: applies `other` first.  `other` may be a Matrix4 or
+        # any 4x4 with rows / cols / data, such as Matrix
+        if not isinstance(other, Matrix4):
+            other = Matrix4.from_matrix(other)
+
+        (a00, a01, a02, a03,
+         a10, a11, a12, a13,
+         a20, a21, a22, a23,
+         a30, a31, a32, a33) = self.m
+
+        (b00, b01, b02, b03,
+         b10, b11, b12, b13,
+         b20, b21, b22, b23,
+         b30, b31, b32, b33) = other.m
+
+        return Matrix4((
+            a00*b00 + a01*b10 + a02*b20 + a03*b30,
+            a00*b01 + a01*b11 + a02*b21 + a03*b31,
+            a00*b02 + a01*b12 + a02*b22 + a03*b32,
+            a00*b03 + a01*b13 + a02*b23 + a03*b33,
+
+            a10*b00 + a11*b10 + a12*b20 + a13*b30,
+            a10*b01 + a11*b11 + a12*b21 + a13*b31,
+            a10*b02 + a11*b12 + a12*b22 + a13*b32,
+            a10*b03 + a11*b13 + a12*b23 + a13*b33,
+
+            a20*b00 + a21*b10 + a22*b20 + a23*b30,
+            a20*b01 + a21*b11 + a22*b21 + a23*b31,
+            a20*b02 + a21*b12 + a22*b22 + a23*b32,
+            a20*b03 + a21*b13 + a22*b23 + a23*b33,
+
+            a30*b00 + a31*b10 + a32*b20 + a33*b30,
+            a30*b01 + a31*b11 + a32*b21 + a33*b31,
+            a30*b02 + a31*b12 + a32*b22 + a33*b32,
+            a30*b03 + a31*b13 + a32*b23 + a33*b33,
+        ))
+
+    def transpose(self):
+
+        m = self.m
+
+        return Matrix4((
+            m[0], m[4], m[8], m[12],
+            m[1], m[5], m[9], m[13],
+            m[2], m[6], m[10], m[14],
+            m[3], m[7], m[11], m[15],
+        ))
+
+    def transform_point(self, v):
+
+        # (x, y, z, 1) through the transform, divided by w
+        (a00, a01, a02, a03,
+         a10, a11, a12, a13,
+         a20, a21, a22, a23,
+         a30, a31, a32, a33) = self.m
+
+        x, y, z = (v.x, v.y, v.z) if isinstance(v, Vector3) else _xyz(v)
+
+        w = a30*x + a31*y + a32*z + a33
+
+        if w != 1.0:
+            w = 1.0 / w
+
+            return Vector3(
+                (a00*x + a01*y + a02*z + a03) * w,
+                (a10*x + a11*y + a12*z + a13) * w,
+                (a20*x + a21*y + a22*z + a23) * w
+            )
+
+        return Vector3(
+            a00*x + a01*y + a02*z + a03,
+            a10*x + a11*y + a12*z + a13,
+            a20*x + a21*y + a22*z + a23
+        )
+
+    def transform_vector(self, v):
+
+        # Direction (x, y, z, 0): ignores translation
+        (a00, a01, a02, _,
+         a10, a11, a12, _,
+         a20, a21, a22, _,
+         _, _, _, _) = self.m
+
+        x, y, z = (v.x, v.y, v.z) if isinstance(v, Vector3) else _xyz(v)
+
+        return Vector3(
+            a00*x + a01*y + a02*z,
+            a10*x + a11*y + a12*z,
+            a20*x + a21*y + a22*z
+        )
+
+    def __matmul__(self, other):
+
+        if isinstance(other, (Matrix4, Matrix)):
+            return self.multiply(other)
+
+        if isinstance(other, (Vector3, Vector)):
+            return self.transform_point(other)
+
+        return NotImplemented
+
+    def __rmatmul__(self, other):
+
+        # Matrix @ Matrix4; Matrix.__matmul__ defers for non-Matrix operands
+        if isinstance(other, Matrix):
+            return Matrix4.from_matrix(other).multiply(self)
+
+        return NotImplemented
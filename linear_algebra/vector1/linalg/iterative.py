@@ -0,0 +1,147 @@
+import math
+from operator import mul
+
+from linalg.matrix import Matrix
+from linalg.sparse import CSRMatrix
+from linalg.vector import Vector, DimensionMismatchError
+
+
+class Solution:
+
+    # Result of an iterative solve: x, the passes taken, the final
+    # relative residual |b - Ax| / |b|, and whether it reached `tol`
+    # within `max_iter`.
+
+    def __init__(self, x, iterations, residual, converged):
+
+        self.x = x
+        self.iterations = iterations
+        self.residual = residual
+        self.converged = converged
+
+
+def _system(a, b, x0):
+
+    if isinstance(a, Matrix):
+        a = CSRMatrix.from_dense(a)
+
+    if a.rows != a.cols:
+        raise ValueError("Iterative solvers need a square matrix")
+
+    b = list(b.data if isinstance(b, Vector) else b)
+
+    if len(b) != a.rows:
+        raise DimensionMismatchError("Right-hand side must have %d entries" % a.rows)
+
+    x = [0.0] * a.rows if x0 is None else list(x0.data if isinstance(x0, Vector) else x0)
+
+    return a, b, x
+
+
+def _norm(v):
+    return math.sqrt(sum(map(mul, v, v)))
+
+
+def conjugate_gradient(a, b, x0=None, tol=1e-8, max_iter=None):
+
+    # Conjugate Gradient for symmetric positive definite A (CSRMatrix or
+    # Matrix); at most n iterations in exact arithmetic, so max_iter
+    # defaults to 2n
+    a, b, x = _system(a, b, x0)
+
+    max_iter = 2 * a.rows if max_iter is None else max_iter
+    bnorm = _norm(b) or 1.0
+
+    r = [bi - ai for bi, ai in zip(b, a._matvec(x))]
+    p = list(r)
+    rr = sum(map(mul, r, r))
+
+    k = 0
+
+    while math.sqrt(rr) / bnorm > tol and k < max_iter:
+
+        ap = a._matvec(p)
+        pap = sum(map(mul, p, ap))
+
+        if pap <= 0:
+            raise ValueError("Matrix is not positive definite")
+
+        alpha = rr / pap
+
+        x = [xi + alpha * pi for xi, pi in zip(x, p)]
+        r = [ri - alpha * qi for ri, qi in zip(r, ap)]
+
+        rr_next = sum(map(mul, r, r))
+        beta = rr_next / rr
+        rr = rr_next
+
+        p = [ri + beta * pi for ri, pi in zip(r, p)]
+        k += 1
+
+    residual = math.sqrt(rr) / bnorm
+
+    return Solution(Vector(x), k, residual, residual <= tol)
+
+
+def sor(a, b, omega=1.0, x0=None, tol=1e-8, max_iter=10000):
+
+    # Successive over-relaxation; omega = 1 is Gauss-Seidel.  Converges
+    # for symmetric positive definite A with 0 < omega < 2, and for
+    # diagonally dominant A with omega = 1.
+    a, b, x = _system(a, b, x0)
+
+    if not 0 < omega < 2:
+        raise ValueError("omega must be in (0, 2)")
+
+    n = a.rows
+    data = a.data
+    indices = a.indices
+    indptr = a.indptr
+
+    # Off-diagonal entries and the diagonal, per row
+    rows = []
+
+    for i in range(n):
+
+        s = indptr[i]
+        e = indptr[i + 1]
+        cols = indices[s:e]
+        vals = data[s:e]
+
+        diag = 0.0
+        off_cols = []
+        off_vals = []
+
+        for j, v in zip(cols, vals):
+
+            if j == i:
+                diag += v
+            else:
+                off_cols.append(j)
+                off_vals.append(v)
+
+        if not diag:
+            raise ValueError("SOR needs a nonzero diagonal (row %d)" % i)
+
+        rows.append((off_cols, off_vals, omega / diag))
+
+    bnorm = _norm(b) or 1.0
+    keep = 1.0 - omega
+    get = x.__getitem__
+
+    residual = _norm([bi - ai for bi, ai in zip(b, a._matvec(x))]) / bnorm
+    k = 0
+
+    while residual > tol and k < max_iter:
+
+        for i, (cols, vals, w) in enumerate(rows):
+            x[i] = keep * x[i] + w * (b[i] - sum(map(mul, vals, map(get, cols))))
+
+        k += 1
+        residual = _norm([bi - ai for bi, ai in zip(b, a._matvec(x))]) / bnorm
+
+    return Solution(Vector(x), k, residual, residual <= tol)
+
+
+def gauss_seidel(a, b, x0=None, tol=1e-8, max_iter=10000):
+    return sor(a, b, 1.0, x0, tol, max_iter)
@@ -0,0 +1,303 @@
+from linalg.backend import get_backend
+from linalg.matrix import Matrix
+from linalg.vector import Vector
+
+
+# Lazy expressions over Matrix and Vector.
+#
+#     (lazy(A) @ B @ C @ x).evaluate()
+#
+# records the product instead of computing it.  On evaluate():
+#   - chains of products are ordered by the matrix-chain DP, so A B C x
+#     costs three matrix-vector products instead of two matrix products;
+#   - transposes are pushed down to the leaves and fused into the product
+#     that consumes them (a B^T feeds B's rows to the kernel as its packed
+#     columns, A^T x combines A's rows), never materialized;
+#   - leaves are used in place and only the intermediates the chosen order
+#     needs are built.
+# Vectors take part as n x 1 columns.
+
+
+def lazy(value):
+
+    # Start a lazy expression from a Matrix, Vector or expression
+    if isinstance(value, Expr):
+        return value
+
+    return Leaf(value)
+
+
+def _chain_order(dims):
+
+    # Matrix-chain DP over k operands with shapes dims[i] x dims[i + 1];
+    # returns (cost, split) with split[i][j] the best split of i..j
+    k = len(dims) - 1
+
+    cost = [[0] * k for _ in range(k)]
+    split = [[0] * k for _ in range(k)]
+
+    for length in range(2, k + 1):
+        for i in range(k - length + 1):
+
+            j = i + length - 1
+            best = None
+
+            for s in range(i, j):
+                c = cost[i][s] + cost[s + 1][j] + dims[i] * dims[s + 1] * dims[j + 1]
+
+                if best is None or c < best:
+                    best = c
+                    split[i][j] = s
+
+            cost[i][j] = best
+
+    return cost[0][k - 1] if k else 0, split
+
+
+class Expr:
+
+    # Node of a lazy expression, with its (rows, cols) shape known up
+    # front so mismatches raise when the expression is built
+
+    def add(self, other):
+        return Sum([self, lazy(other)])
+
+    def multiply(self, other):
+        return Product([self, lazy(other)])
+
+    def __add__(self, other):
+        return self.add(other) if isinstance(other, (Expr, Matrix, Vector)) else NotImplemented
+
+    def __radd__(self, other):
+        return lazy(other).add(self) if isinstance(other, (Matrix, Vector)) else NotImplemented
+
+    def __matmul__(self, other):
+        return self.multiply(other) if isinstance(other, (Expr, Matrix, Vector)) else NotImplemented
+
+    def __rmatmul__(self, other):
+        return lazy(other).multiply(self) if isinstance(other, (Matrix, Vector)) else NotImplemented
+
+    @property
+    def T(self):
+        return self.transpose()
+
+    def cost(self):
+
+        # Scalar multiplications the chosen evaluation order spends
+        return self._cost()
+
+    def evaluate(self, backend=None):
+
+        kind, data = self._eval(backend)
+
+        if isinstance(self, Leaf) and kind != "trans":
+            # A bare leaf hands back its input's lists; copy them so the
+            # result never aliases the input
+            data = list(data) if kind == "vec" else [list(row) for row in data]
+
+        if kind == "vec":
+            return Vector(data)
+
+        if kind == "trans":
+            data = [list(col) for col in zip(*data)]
+
+        return Matrix(data)
+
+
+class Leaf(Expr):
+
+    def __init__(self, value, transposed=False):
+
+        if not isinstance(value, (Matrix, Vector)):
+            raise TypeError("Lazy leaves must be Matrix or Vector")
+
+        self.value = value
+        self.transposed = transposed
+
+        shape = (value.n, 1) if isinstance(value, Vector) else (value.rows, value.cols)
+        self.shape = shape[::-1] if transposed else shape
+
+    def transpose(self):
+        return Leaf(self.value, not self.transposed)
+
+    def __repr__(self):
+
+        rows, cols = self.shape[::-1] if self.transposed else self.shape
+
+        return "%s%dx%d%s" % (
+            type(self.value).__name__[0], rows, cols,
+            "^T" if self.transposed else ""
+        )
+
+    def _cost(self):
+        return 0
+
+    def _eval(self, backend):
+
+        value = self.value
+
+        if isinstance(value, Vector):
+            # A transposed vector is a 1 x n row
+            return ("rows", [list(value.data)]) if self.transposed else ("vec", value.data)
+
+        return ("trans" if self.transposed else "rows"), value.data
+
+
+def _rows(kind, data):
+
+    # Materialize an evaluated operand as rows
+    if kind == "rows":
+        return data
+
+    if kind == "trans":
+        return [list(col) for col in zip(*data)]
+
+    return [[x] for x in data]
+
+
+class Sum(Expr):
+
+    def __init__(self, terms):
+
+        flat = []
+
+        for t in terms:
+            flat.extend(t.terms if isinstance(t, Sum) else [t])
+
+        shape = flat[0].shape
+
+        if any(t.shape != shape for t in flat):
+            raise ValueError("Matrices must have same dimensions")
+
+        self.terms = flat
+        self.shape = shape
+
+    def transpose(self):
+        return Sum([t.transpose() for t in self.terms])
+
+    def __repr__(self):
+        return "(" + " + ".join(map(repr, self.terms)) + ")"
+
+    def _cost(self):
+        return sum(t._cost() for t in self.terms)
+
+    def _eval(self, backend):
+
+        rows, cols = self.shape
+
+        parts = [t._eval(backend) for t in self.terms]
+        be = get_backend(backend, rows * cols, [data for _, data in parts])
+
+        if all(kind == "vec" for kind, _ in parts):
+            acc = parts[0][1]
+
+            for _, data in parts[1:]:
+                acc = be.add([acc], [data])[0]
+
+            return "vec", acc
+
+        acc = _rows(*parts[0])
+
+        for kind, data in parts[1:]:
+            acc = be.add(acc, _rows(kind, data))
+
+        return "rows", acc
+
+
+class Product(Expr):
+
+    def __init__(self, factors):
+
+        flat = []
+
+        for f in factors:
+            flat.extend(f.factors if isinstance(f, Product) else [f])
+
+        for a, b in zip(flat, flat[1:]):
+            if a.shape[1] != b.shape[0]:
+                raise ValueError("Invalid matrix multiplication")
+
+        self.factors = flat
+        self.shape = (flat[0].shape[0], flat[-1].shape[1])
+        self.dims = [f.shape[0] for f in flat] + [flat[-1].shape[1]]
+
+        self._order = None
+
+    def transpose(self):
+        return Product([f.transpose() for f in reversed(self.factors)])
+
+    def _split(self):
+
+        if self._order is None:
+            self._order = _chain_order(self.dims)
+
+        return self._order
+
+    def order(self):
+
+        # The chosen parenthesization, e.g. "(M100x100 (M100x100 V100x1))"
+        _, split = self._split()
+
+        def show(i, j):
+            if i == j:
+                return repr(self.factors[i])
+
+            s = split[i][j]
+            return "(%s %s)" % (show(i, s), show(s + 1, j))
+
+        return show(0, len(self.factors) - 1)
+
+    def __repr__(self):
+        return self.order()
+
+    def _cost(self):
+        return self._split()[0] + sum(f._cost() for f in self.factors)
+
+    def naive_cost(self):
+
+        # Left-to-right evaluation, for comparison
+        d = self.dims
+        return sum(d[0] * d[i] * d[i + 1] for i in range(1, len(d) - 1))
+
+    def _eval(self, backend):
+
+        _, split = self._split()
+        operands = [f._eval(backend) for f in self.factors]
+
+        def run(i, j):
+
+            if i == j:
+                return operands[i]
+
+            s = split[i][j]
+            return _multiply(run(i, s), run(s + 1, j), backend)
+
+        return run(0, len(self.factors) - 1)
+
+
+def _multiply(a, b, backend):
+
+    # Product of two evaluated operands, fusing transposed leaves
+    ka, da = a
+    kb, db = b
+
+    if kb == "vec":
+
+        if ka == "vec":
+            # n x 1 times 1 x 1
+            da = [[x] for x in da]
+            ka = "rows"
+
+        size = len(da) * (len(da[0]) if da else 0)
+        be = get_backend(backend, size, (da, db))
+
+        return "vec", be.matvec(da, db, transpose=(ka == "trans"))
+
+    da = _rows(ka, da)
+    cols = len(db) if kb == "trans" else len(db[0])
+    be = get_backend(backend, len(da) * len(db) + len(db) * cols, (da, db))
+
+    if kb == "trans":
+        return "rows", be.matmul(da, db, transpose_b=True)
+
+    return "rows", be.matmul(da, db)
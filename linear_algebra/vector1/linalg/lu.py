@@ -0,0 +1,164 @@
+from operator import mul
+import sys
+
+from linalg.matrix import Matrix, NotSquareMatrixError, SingularMatrixError
+from linalg.vector import Vector, DimensionMismatchError
+
+
+class LU:
+
+    # PA = LU with partial pivoting, factored once.
+    #
+    # Each solve is a forward and a back substitution, O(n^2), so the same
+    # factorization serves any number of right-hand sides.  A pivot no
+    # larger than `tol` (default n * eps * max |a_ij|) marks the matrix
+    # singular: det() is then 0 and solve() / inverse() raise.
+
+    def __init__(self, m, tol=None):
+
+        if m.rows != m.cols:
+            raise NotSquareMatrixError("LU needs a square matrix")
+
+        n = m.rows
+        a = [[float(x) for x in row] for row in m.data]
+
+        if tol is None:
+            scale = max((abs(x) for row in a for x in row), default=0.0)
+            tol = n * sys.float_info.epsilon * scale
+
+        perm = list(range(n))
+        sign = 1
+        singular = False
+
+        for k in range(n):
+
+            p = max(range(k, n), key=lambda i: abs(a[i][k]))
+
+            if p != k:
+                a[k], a[p] = a[p], a[k]
+                perm[k], perm[p] = perm[p], perm[k]
+                sign = -sign
+
+            pivot = a[k][k]
+
+            if abs(pivot) <= tol:
+                singular = True
+                continue
+
+            tail = a[k][k + 1:]
+
+            for i in range(k + 1, n):
+
+                row = a[i]
+                f = row[k] / pivot
+                row[k] = f
+
+                if f:
+                    row[k + 1:] = [x - f * y for x, y in zip(row[k + 1:], tail)]
+
+        self.n = n
+        self.perm = perm
+        self.sign = sign
+        self.singular = singular
+        self.tol = tol
+
+        # Substitution rows: L below the diagonal, U's diagonal, and U
+        # right of the diagonal reversed (back substitution builds x
+        # from the end)
+        self.lower = [row[:i] for i, row in enumerate(a)]
+        self.diag = [row[i] for i, row in enumerate(a)]
+        self.upper = [row[:i:-1] for i, row in enumerate(a)]
+
+    def L(self):
+
+        return Matrix([
+            row + [1.0] + [0.0] * (self.n - i - 1)
+            for i, row in enumerate(self.lower)
+        ])
+
+    def U(self):
+
+        return Matrix([
+            [0.0] * i + [d] + row[::-1]
+            for i, (d, row) in enumerate(zip(self.diag, self.upper))
+        ])
+
+    def P(self):
+
+        # Permutation matrix with PA = LU
+        return Matrix([
+            [1.0 if j == p else 0.0 for j in range(self.n)]
+            for p in self.perm
+        ])
+
+    def _check(self):
+        if self.singular:
+            raise SingularMatrixError("Matrix is singular")
+
+    def _solve(self, b):
+
+        # Forward substitution on Pb, then back substitution
+        y = []
+
+        for p, row in zip(self.perm, self.lower):
+            y.append(b[p] - sum(map(mul, row, y)))
+
+        x = []
+
+        for yi, d, row in zip(reversed(y), reversed(self.diag), reversed(self.upper)):
+            x.append((yi - sum(map(mul, row, x))) / d)
+
+        x.reverse()
+        return x
+
+    def solve(self, b):
+
+        # x with Ax = b, for a Vector or list b
+        self._check()
+
+        data = b.data if isinstance(b, Vector) else b
+
+        if len(data) != self.n:
+            raise DimensionMismatchError("Right-hand side must have %d entries" % self.n)
+
+        return Vector(self._solve(data))
+
+    def solve_many(self, bs):
+
+        # One solution per right-hand side, reusing the factorization
+        return [self.solve(b) for b in bs]
+
+    def solve_matrix(self, m):
+
+        # X with AX = B
+        self._check()
+
+        if m.rows != self.n:
+            raise ValueError("Invalid matrix dimensions")
+
+        cols = [self._solve(col) for col in zip(*m.data)]
+        return Matrix([list(row) for row in zip(*cols)])
+
+    def det(self):
+
+        if self.singular:
+            return 0.0
+
+        d = float(self.sign)
+
+        for x in self.diag:
+            d *= x
+
+        return d
+
+    def inverse(self):
+
+        self._check()
+
+        n = self.n
+        cols = [
+            self._solve([1.0 if i == j else 0.0 for i in range(n)])
+            for j in range(n)
+        ]
+
+        return Matrix([list(row) for row in zip(*cols)])
@@ -1,51 +1,107 @@
+from numbers import Number
+
+from linalg.backend import get_backend
+from linalg.vector import Vector, DimensionMismatchError
+
+
 class NotSquareMatrixError(Exception):
     pass
 
 
+class SingularMatrixError(Exception):
+    pass
+
+
 class Matrix:
 
+    # add, sub, scalar_multiply and multiply take an optional `out`
+    # Matrix (or Vector, for matrix-vector products) of the result's shape
+    # and write into its existing row lists.  +=, -= and *= do the same on
+    # self.
+    #
+    # Heavy operations run on a compute backend (see linalg.backend),
+    # chosen per call with `backend=` or globally with set_backend().
+
     def __init__(self, data):
 
         self.data = data
         self.rows = len(data)
         self.cols = len(data[0]) if data else 0
 
-    def add(self, m):
+    def _check_out(self, out, rows, cols):
+
+        if out.rows != rows or out.cols != cols:
+            raise ValueError("Output matrix must be %dx%d" % (rows, cols))
+
+    def _elementwise(self, m, name, out, backend):
 
         if self.rows != m.rows or self.cols != m.cols:
             raise ValueError("Matrices must have same dimensions")
 
-        return Matrix([
-            [
-                self.data[i][j] + m.data[i][j]
-                for j in range(self.cols)
-            ]
-            for i in range(self.rows)
-        ])
+        if out is not None:
+            self._check_out(out, self.rows, self.cols)
+
+        be = get_backend(backend, self.rows * self.cols, (self.data, m.data))
+        rows = getattr(be, name)(self.data, m.data, None if out is None else out.data)
+
+        return Matrix(rows) if out is None else out
+
+    def add(self, m, out=None, backend=None):
+        return self._elementwise(m, "add", out, backend)
+
+    def sub(self, m, out=None, backend=None):
+        return self._elementwise(m, "sub", out, backend)
+
+    def scalar_multiply(self, scalar, out=None, backend=None):
 
-    def multiply(self, m):
+        if out is not None:
+            self._check_out(out, self.rows, self.cols)
+
+        be = get_backend(backend, self.rows * self.cols, (self.data,))
+        rows = be.scale(self.data, scalar, None if out is None else out.data)
+
+        return Matrix(rows) if out is None else out
+
+    def multiply(self, m, out=None, backend=None, workers=None):
+
+        # Matrix times Matrix, or Matrix times Vector.  `workers` sets the
+        # process count for large pure-Python products (linalg.parallel)
+        if isinstance(m, Vector):
+            return self._multiply_vector(m, out, backend)
 
         if self.cols != m.rows:
             raise ValueError("Invalid matrix multiplication")
 
-        result = []
+        if out is not None:
+            self._check_out(out, self.rows, m.cols)
+
+        # Pure Python uses the packed, blocked kernel (Strassen for large
+        # products)
+        be = get_backend(
+            backend, self.rows * self.cols + m.rows * m.cols, (self.data, m.data)
+        )
+        rows = be.matmul(self.data, m.data, None if out is None else out.data, workers=workers)
 
-        for i in range(self.rows):
+        return Matrix(rows) if out is None else out
 
-            row = []
+    def _multiply_vector(self, v, out, backend):
 
-            for j in range(m.cols):
+        if self.cols != v.n:
+            raise DimensionMismatchError("Vector must have dimension %d" % self.cols)
 
-                value = sum(
-                    self.data[i][k] * m.data[k][j]
-                    for k in range(self.cols)
-                )
+        values = get_backend(
+            backend, self.rows * self.cols, (self.data, v.data)
+        ).matvec(self.data, v.data)
 
-                row.append(value)
+        if out is None:
+            return Vector(values)
 
-            result.append(row)
+        if out.n != self.rows:
+            raise DimensionMismatchError("Output vector must have dimension %d" % self.rows)
 
-        return Matrix(result)
+        out.data[:] = values
+
+        return out
 
     def transpose(self):
 
@@ -55,4 +111,122 @@ class Matrix:
                 for j in range(self.rows)
             ]
             for i in range(self.cols)
-        ])
\ No newline at end of file
+        ])
+
+    def lazy(self):
+
+        # Deferred expression; see linalg.lazy
+        from linalg.lazy import Leaf
+
+        return Leaf(self)
+
+    def to_strided(self):
+
+        # Flat array('d') storage; see linalg.strided
+        from linalg.strided import StridedMatrix
+
+        return StridedMatrix.from_matrix(self)
+
+    def save(self, path, dtype="d"):
+
+        # Binary file with a dtype / shape header; see linalg.storage
+        from linalg.storage import save
+
+        save(self, path, dtype)
+
+    @classmethod
+    def load(cls, path, mmap_mode=None, rows=None):
+
+        # Matrix from a file written by save().  mmap_mode ("r", "r+",
+        # "c") maps the file instead and returns a StridedMatrix view;
+        # rows=(start, stop) reads only that row range.
+        from linalg import storage
+
+        if rows is not None:
+            if mmap_mode is not None:
+                return storage.open_mapped(path, mmap_mode).block(*rows, 0, storage.header(path).cols)
+
+            return storage.read_rows(path, *rows)
+
+        return storage.load(path, mmap_mode)
+
+    def lu(self, tol=None):
+
+        # Factor once, then solve / det / inverse from it; see linalg.lu
+        from linalg.lu import LU
+
+        return LU(self, tol)
+
+    def _square(self):
+        if self.rows != self.cols:
+            raise NotSquareMatrixError("Matrix must be square")
+
+    def det(self, backend=None):
+
+        self._square()
+        return get_backend(backend, self.rows * self.cols, (self.data,)).det(self.data)
+
+    def inverse(self, backend=None):
+
+        self._square()
+        return Matrix(get_backend(backend, self.rows * self.cols, (self.data,)).inverse(self.data))
+
+    def rank(self):
+
+        # Exact rank by fraction-free elimination; see linalg.exact
+        from linalg.exact import rank
+
+        return rank(self)
+
+    def solve(self, b, backend=None):
+
+        # For many right-hand sides, factor once with lu() instead
+        self._square()
+
+        data = b.data if isinstance(b, Vector) else b
+
+        if len(data) != self.rows:
+            raise DimensionMismatchError("Right-hand side must have %d entries" % self.rows)
+
+        return Vector(get_backend(
+            backend, self.rows * self.cols, (self.data, data)
+        ).solve(self.data, data))
+
+    def __add__(self, m):
+        return self.add(m) if isinstance(m, Matrix) else NotImplemented
+
+    def __sub__(self, m):
+        return self.sub(m) if isinstance(m, Matrix) else NotImplemented
+
+    def __mul__(self, scalar):
+        return self.scalar_multiply(scalar) if isinstance(scalar, Number) else NotImplemented
+
+    __rmul__ = __mul__
+
+    def __matmul__(self, m):
+        return self.multiply(m) if isinstance(m, (Matrix, Vector)) else NotImplemented
+
+    def __iadd__(self, m):
+        return self.add(m, out=self) if isinstance(m, Matrix) else NotImplemented
+
+    def __isub__(self, m):
+        return self.sub(m, out=self) if isinstance(m, Matrix) else NotImplemented
+
+    def __imul__(self, scalar):
+        return self.scalar_multiply(scalar, out=self) if isinstance(scalar, Number) else NotImplemented
+
+    def __neg__(self):
+        return self.scalar_multiply(-1)
+
+    def eigenvalues(self, **kwargs):
+
+        # Hessenberg + shifted QR; see linalg.eigen for the other solvers
+        from linalg.eigen import eigenvalues
+
+        return eigenvalues(self, **kwargs)
+
+    def svd(self, **kwargs):
+
+        from linalg.eigen import svd
+
+        return svd(self, **kwargs)
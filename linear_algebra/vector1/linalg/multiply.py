@@ -0,0 +1,148 @@
+import operator
+from operator import mul
+
+
+# Tile edge for the blocked kernel.  Pure Python gains little from cache
+# blocking, so tiles are large; the main win is packing B once so every
+# dot product walks two flat lists.
+BLOCK_SIZE = 128
+
+# Near-square products whose smallest dimension reaches this size use
+# Strassen, which recurses down to the blocked kernel.  0 disables it.
+STRASSEN_THRESHOLD = 128
+
+
+def pack(b):
+
+    # B's columns as rows
+    return [list(col) for col in zip(*b)]
+
+
+def blocked(a, b, block=None, packed=False, out=None):
+
+    # C = A B, tiled over rows of A, columns of B and the shared dimension.
+    # With packed=True, `b` is already B transposed.  Given `out` (rows
+    # of the right shape, not aliasing a or b), C is written into it.
+    # Sums start from int 0, as sum() does, so int and Fraction inputs
+    # give exact results.
+    block = block or BLOCK_SIZE
+
+    bt = b if packed else pack(b)
+
+    n = len(a)
+    m = len(a[0]) if a else 0
+    p = len(bt)
+
+    if out is None:
+        c = [[0] * p for _ in range(n)]
+    else:
+        c = out
+
+        for row in c:
+            for j in range(p):
+                row[j] = 0
+
+    for k0 in range(0, m, block):
+        k1 = min(k0 + block, m)
+        whole = k0 == 0 and k1 == m
+
+        for j0 in range(0, p, block):
+            j1 = min(j0 + block, p)
+            cols = [col if whole else col[k0:k1] for col in bt[j0:j1]]
+
+            for i0 in range(0, n, block):
+                for i in range(i0, min(i0 + block, n)):
+                    row = a[i] if whole else a[i][k0:k1]
+                    out = c[i]
+
+                    for j, col in enumerate(cols, j0):
+                        out[j] += sum(map(mul, row, col))
+
+    return c
+
+
+def _add(x, y):
+    return [list(map(operator.add, r, s)) for r, s in zip(x, y)]
+
+
+def _sub(x, y):
+    return [list(map(operator.sub, r, s)) for r, s in zip(x, y)]
+
+
+def _split(x, h):
+    return (
+        [r[:h] for r in x[:h]], [r[h:] for r in x[:h]],
+        [r[:h] for r in x[h:]], [r[h:] for r in x[h:]],
+    )
+
+
+def _pad(x, rows, cols):
+
+    # Zero-pad x to rows x cols
+    out = [r + [0] * (cols - len(r)) for r in x]
+    out.extend([0] * cols for _ in range(rows - len(x)))
+    return out
+
+
+def strassen(a, b, threshold=None, block=None):
+
+    threshold = threshold or STRASSEN_THRESHOLD
+
+    n = len(a)
+    m = len(b)
+    p = len(b[0]) if b else 0
+
+    if min(n, m, p) < threshold:
+        return blocked(a, b, block)
+
+    # Pad to an even square, recurse on quadrants, trim
+    size = max(n, m, p)
+    size += size % 2
+    h = size // 2
+
+    a11, a12, a21, a22 = _split(_pad(a, size, size), h)
+    b11, b12, b21, b22 = _split(_pad(b, size, size), h)
+
+    def rec(x, y):
+        return strassen(x, y, threshold, block)
+
+    m1 = rec(_add(a11, a22), _add(b11, b22))
+    m2 = rec(_add(a21, a22), b11)
+    m3 = rec(a11, _sub(b12, b22))
+    m4 = rec(a22, _sub(b21, b11))
+    m5 = rec(_add(a11, a12), b22)
+    m6 = rec(_sub(a21, a11), _add(b11, b12))
+    m7 = rec(_sub(a12, a22), _add(b21, b22))
+
+    c11 = _add(_sub(_add(m1, m4), m5), m7)
+    c12 = _add(m3, m5)
+    c21 = _add(m2, m4)
+    c22 = _add(_sub(_add(m1, m3), m2), m6)
+
+    top = [r + s for r, s in zip(c11, c12)]
+    bottom = [r + s for r, s in zip(c21, c22)]
+
+    return [r[:p] for r in (top + bottom)[:n]]
+
+
+def matmul(a, b, block=None, threshold=None, out=None):
+
+    # Product of two lists of rows, optionally written into `out`
+    if threshold is None:
+        threshold = STRASSEN_THRESHOLD
+
+    dims = (len(a), len(b), len(b[0]) if b else 0)
+
+    # Strassen pads to a square, so skip it for lopsided shapes
+    if threshold and threshold <= min(dims) and max(dims) <= 2 * min(dims):
+        c = strassen(a, b, threshold, block)
+
+        if out is None:
+            return c
+
+        for row, src in zip(out, c):
+            row[:] = src
+
+        return out
+
+    return blocked(a, b, block, out=out)
@@ -0,0 +1,147 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from linalg.multiply import blocked
+
+
+# Products of at least this many multiply-adds (n * m * p) go parallel
+# when more than one worker is available.
+PARALLEL_MIN_WORK = 192 ** 3
+
+# Worker processes; LINALG_WORKERS overrides the core count
+WORKERS = int(os.environ.get("LINALG_WORKERS", 0)) or os.cpu_count() or 1
+
+_pool = None
+_pool_size = 0
+
+
+def _executor(workers):
+
+    # One pool, kept between calls and regrown on demand, so process
+    # start-up is paid once
+    global _pool, _pool_size
+
+    if _pool is None or _pool_size < workers:
+        shutdown()
+        _pool = ProcessPoolExecutor(workers)
+        _pool_size = workers
+
+    return _pool
+
+
+def shutdown():
+
+    global _pool, _pool_size
+
+    if _pool is not None:
+        _pool.shutdown()
+
+    _pool = None
+    _pool_size = 0
+
+
+def _share(values):
+
+    # Flat doubles in a new shared memory block
+    block = shared_memory.SharedMemory(create=True, size=max(len(values) * 8, 8))
+
+    with block.buf.cast("d") as view:
+        view[:len(values)] = values
+
+    return block
+
+
+def _work(names, n, m, p, r0, r1):
+
+    # Rows r0..r1 of C = A B in a worker: A and B^T (packed) are read from
+    # shared memory, the rows written back into C's block
+    blocks = []
+    views = []
+
+    try:
+        for name in names:
+            blocks.append(shared_memory.SharedMemory(name))
+
+        views = [block.buf.cast("d") for block in blocks]
+        a, bt, c = views
+
+        rows = [a[i * m:(i + 1) * m].tolist() for i in range(r0, r1)]
+        cols = [bt[j * m:(j + 1) * m].tolist() for j in range(p)]
+
+        for i, row in enumerate(blocked(rows, cols, packed=True), r0):
+            c[i * p:(i + 1) * p] = array("d", row)
+
+    finally:
+        # Views first: closing a block with a live view raises BufferError
+        # and would hide the real error
+        for view in views:
+            view.release()
+
+        for block in blocks:
+            block.close()
+
+
+def use_parallel(n, m, p, workers=None, operands=()):
+
+    # Operands travel as float64, so only all-float products go parallel;
+    # int and Fraction products stay exact on the serial path
+    from linalg.backend import _all_float
+
+    workers = WORKERS if workers is None else workers
+    return workers > 1 and n * m * p >= PARALLEL_MIN_WORK and _all_float(operands)
+
+
+def matmul(a, b, workers=None, out=None):
+
+    # C = A B for lists of float rows, split into row blocks across
+    # `workers` processes (default WORKERS).  Operands and result live in
+    # shared memory; only block names and row ranges are pickled.
+    #
+    # Workers are started with the platform's default method; under spawn
+    # (macOS, Windows) they re-import the main module, so scripts calling
+    # this must keep their top-level code behind `if __name__ == "__main__"`.
+    workers = WORKERS if workers is None else workers
+
+    n = len(a)
+    m = len(b)
+    p = len(b[0]) if b else 0
+
+    blocks = []
+
+    try:
+        blocks.append(_share(array("d", (x for row in a for x in row))))
+        blocks.append(_share(array("d", (x for col in zip(*b) for x in col))))
+        blocks.append(_share(array("d", [0.0]) * (n * p)))
+
+        names = [block.name for block in blocks]
+
+        # A few blocks per worker, for balance
+        chunks = max(1, min(n, workers * 4))
+        bounds = [n * k // chunks for k in range(chunks + 1)]
+
+        pool = _executor(workers)
+        jobs = [
+            pool.submit(_work, names, n, m, p, r0, r1)
+            for r0, r1 in zip(bounds, bounds[1:]) if r1 > r0
+        ]
+
+        for job in jobs:
+            job.result()
+
+        with blocks[2].buf.cast("d") as c:
+            rows = [c[i * p:(i + 1) * p].tolist() for i in range(n)]
+
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    if out is None:
+        return rows
+
+    for o, row in zip(out, rows):
+        o[:] = row
+
+    return out
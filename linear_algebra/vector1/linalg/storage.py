@@ -0,0 +1,209 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from linalg.matrix import Matrix
+
+
+# Binary matrix files.
+#
+#     header   24 bytes: magic b"LAMX", version, dtype code, 2 pad bytes,
+#              rows and cols as little-endian uint64
+#     payload  rows * cols values, row-major, little-endian
+#
+# dtype is an array type code: "d" (float64), "f" (float32) or "q"
+# (int64).  The payload starts 8-byte aligned, so a float64 file can be
+# memory-mapped and used in place as a StridedMatrix; pages are read only
+# when touched.  Row ranges seek straight to their bytes.
+
+MAGIC = b"LAMX"
+VERSION = 1
+DTYPES = {"d": 8, "f": 4, "q": 8}
+
+HEADER = struct.Struct("<4sBc2xQQ")
+
+ACCESS = {"r": mmap.ACCESS_READ, "r+": mmap.ACCESS_WRITE, "c": mmap.ACCESS_COPY}
+
+
+class Header:
+
+    def __init__(self, dtype, rows, cols):
+
+        self.dtype = dtype
+        self.rows = rows
+        self.cols = cols
+
+    @property
+    def itemsize(self):
+        return DTYPES[self.dtype]
+
+    @property
+    def row_bytes(self):
+        return self.cols * self.itemsize
+
+    def __repr__(self):
+        return "Header(%r, %d, %d)" % (self.dtype, self.rows, self.cols)
+
+
+def _little(values):
+
+    # array in little-endian byte order, swapped in place if needed
+    if sys.byteorder == "big":
+        values.byteswap()
+
+    return values
+
+
+def _rows_of(m):
+
+    # Row sequences of a Matrix, StridedMatrix or list of rows
+    if isinstance(m, Matrix):
+        return m.data, m.rows, m.cols
+
+    if hasattr(m, "row_values"):
+        return [m.row_values(i) for i in range(m.rows)], m.rows, m.cols
+
+    return m, len(m), len(m[0]) if m else 0
+
+
+def save(m, path, dtype="d"):
+
+    # Written one row at a time, so no second copy of the matrix is built.
+    # The file goes to a temporary name beside `path` and replaces it only
+    # once complete, so a failed save leaves any existing file intact.
+    if dtype not in DTYPES:
+        raise ValueError("Unknown dtype: %s" % dtype)
+
+    rows, n, cols = _rows_of(m)
+
+    if any(len(row) != cols for row in rows):
+        raise ValueError("Rows must all have the same length")
+
+    tmp = "%s.%d.tmp" % (path, os.getpid())
+
+    try:
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, dtype.encode(), n, cols))
+
+            if (
+                dtype == "d" and sys.byteorder == "little" and
+                hasattr(m, "memoryview") and m.is_contiguous()
+            ):
+                # Contiguous StridedMatrix: its buffer is the payload as is
+                f.write(m.memoryview())
+            else:
+                for row in rows:
+                    _little(array(dtype, row)).tofile(f)
+
+        os.replace(tmp, path)
+
+    except BaseException as e:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+        if isinstance(e, (TypeError, OverflowError)):
+            raise ValueError("Values do not fit dtype %r: %s" % (dtype, e)) from None
+
+        raise
+
+
+def _read_header(f):
+
+    raw = f.read(HEADER.size)
+
+    if len(raw) < HEADER.size:
+        raise ValueError("Not a matrix file: too short")
+
+    magic, version, dtype, rows, cols = HEADER.unpack(raw)
+    dtype = dtype.decode("ascii", "replace")
+
+    if magic != MAGIC:
+        raise ValueError("Not a matrix file: bad magic %r" % magic)
+
+    if version != VERSION:
+        raise ValueError("Unsupported matrix file version: %d" % version)
+
+    if dtype not in DTYPES:
+        raise ValueError("Unknown dtype: %s" % dtype)
+
+    return Header(dtype, rows, cols)
+
+
+def header(path):
+
+    with open(path, "rb") as f:
+        return _read_header(f)
+
+
+def read_rows(path, start=0, stop=None):
+
+    # Rows start..stop as a Matrix, reading only their bytes
+    with open(path, "rb") as f:
+        h = _read_header(f)
+
+        stop = h.rows if stop is None else stop
+
+        if not 0 <= start <= stop <= h.rows:
+            raise IndexError("Row range out of range")
+
+        f.seek(HEADER.size + start * h.row_bytes)
+
+        values = array(h.dtype)
+
+        try:
+            values.fromfile(f, (stop - start) * h.cols)
+        except EOFError:
+            raise ValueError("Matrix file is truncated")
+
+    _little(values)
+
+    return Matrix([
+        values[i:i + h.cols].tolist()
+        for i in range(0, len(values), h.cols)
+    ] if h.cols else [[] for _ in range(stop - start)])
+
+
+def load(path, mmap_mode=None):
+
+    # The whole file as a Matrix, or with mmap_mode as a StridedMatrix
+    # over the mapped file: "r" read-only, "r+" writes go to the file,
+    # "c" copy-on-write.  Mapping needs a float64 file on a little-endian
+    # machine, since the payload is used as it lies.
+    if mmap_mode is None:
+        return read_rows(path)
+
+    return open_mapped(path, mmap_mode)
+
+
+def open_mapped(path, mode="r"):
+
+    from linalg.strided import StridedMatrix
+
+    if mode not in ACCESS:
+        raise ValueError("Unknown mmap mode: %s" % mode)
+
+    with open(path, "r+b" if mode == "r+" else "rb") as f:
+        h = _read_header(f)
+
+        if h.dtype != "d":
+            raise ValueError("Only float64 files can be mapped, not %r" % h.dtype)
+
+        if sys.byteorder == "big":
+            raise ValueError("Mapping needs a little-endian machine")
+
+        size = HEADER.size + h.rows * h.row_bytes
+
+        if os.fstat(f.fileno()).st_size < size:
+            raise ValueError("Matrix file is truncated")
+
+        if size == HEADER.size:
+            return StridedMatrix(array("d"), h.rows, h.cols)
+
+        # The mapping stays valid after the file is closed
+        mapped = mmap.mmap(f.fileno(), size, access=ACCESS[mode])
+
+    view = memoryview(mapped)[HEADER.size:].cast("d")
+
+    return StridedMatrix(view, h.rows, h.cols)
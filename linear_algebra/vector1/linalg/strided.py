@@ -0,0 +1,213 @@
+import operator
+from array import array
+
+from linalg.matrix import Matrix
+
+
+class StridedMatrix:
+
+    # Matrix over one flat buffer of doubles.
+    #
+    # Element (i, j) lives at offset + i * row_stride + j * col_stride, so
+    # transpose, rows, columns and blocks are views that share the buffer.
+    # Any 1-D buffer of doubles works (array('d'), a memory-mapped file,
+    # shared memory); it is held as a memoryview so slicing never copies.
+    #
+    # memoryview() exports the data as a 2-D buffer and NumPy reads it
+    # through __array__, both on any Python version.  __buffer__ (PEP 688)
+    # lets memoryview(m) and bytes-like APIs take the matrix directly, but
+    # only from Python 3.12; earlier versions ignore it.
+
+    def __init__(self, buffer, rows, cols, offset=0,
+                 row_stride=None, col_stride=1):
+
+        self.buffer = memoryview(buffer)
+
+        if self.buffer.format != "d":
+            self.buffer = self.buffer.cast("B").cast("d")
+
+        self.rows = rows
+        self.cols = cols
+        self.offset = offset
+        self.row_stride = cols if row_stride is None else row_stride
+        self.col_stride = col_stride
+
+    @classmethod
+    def zeros(cls, rows, cols):
+        return cls(array("d", [0.0]) * (rows * cols), rows, cols)
+
+    @classmethod
+    def from_rows(cls, data):
+
+        rows = len(data)
+        cols = len(data[0]) if data else 0
+
+        buf = array("d")
+
+        for row in data:
+
+            if len(row) != cols:
+                raise ValueError("Rows must all have the same length")
+
+            buf.extend(row)
+
+        return cls(buf, rows, cols)
+
+    @classmethod
+    def from_matrix(cls, m):
+        return cls.from_rows(m.data)
+
+    def to_matrix(self):
+        return Matrix(self.tolist())
+
+    def tolist(self):
+        return [self.row_values(i).tolist() for i in range(self.rows)]
+
+    def is_contiguous(self):
+        return self.col_stride == 1 and (self.row_stride == self.cols or self.rows <= 1)
+
+    def _index(self, i, j):
+
+        if not (0 <= i < self.rows and 0 <= j < self.cols):
+            raise IndexError("Matrix index out of range")
+
+        return self.offset + i * self.row_stride + j * self.col_stride
+
+    def __getitem__(self, ij):
+        return self.buffer[self._index(*ij)]
+
+    def __setitem__(self, ij, value):
+        self.buffer[self._index(*ij)] = value
+
+    def _line(self, start, count, stride):
+
+        # `count` elements from `start`, `stride` apart, as a memoryview
+        if count == 0:
+            return self.buffer[0:0]
+
+        return self.buffer[start:start + (count - 1) * stride + 1:stride]
+
+    def row_values(self, i):
+
+        if not 0 <= i < self.rows:
+            raise IndexError("Row index out of range")
+
+        return self._line(self.offset + i * self.row_stride, self.cols, self.col_stride)
+
+    def col_values(self, j):
+
+        if not 0 <= j < self.cols:
+            raise IndexError("Column index out of range")
+
+        return self._line(self.offset + j * self.col_stride, self.rows, self.row_stride)
+
+    def block(self, r0, r1, c0, c1):
+
+        if not (0 <= r0 <= r1 <= self.rows and 0 <= c0 <= c1 <= self.cols):
+            raise IndexError("Block out of range")
+
+        return StridedMatrix(
+            self.buffer,
+            r1 - r0,
+            c1 - c0,
+            self.offset + r0 * self.row_stride + c0 * self.col_stride,
+            self.row_stride,
+            self.col_stride
+        )
+
+    def row(self, i):
+        return self.block(i, i + 1, 0, self.cols)
+
+    def col(self, j):
+        return self.block(0, self.rows, j, j + 1)
+
+    def transpose(self):
+
+        return StridedMatrix(
+            self.buffer,
+            self.cols,
+            self.rows,
+            self.offset,
+            self.col_stride,
+            self.row_stride
+        )
+
+    def copy(self):
+
+        # Compact, contiguous copy
+        buf = array("d")
+
+        for i in range(self.rows):
+            buf.extend(self.row_values(i))
+
+        return StridedMatrix(buf, self.rows, self.cols)
+
+    def memoryview(self):
+
+        # Zero-copy 2-D (rows, cols) view of the data, for contiguous
+        # matrices; call copy() first on a strided view.
+        if not self.is_contiguous():
+            raise BufferError("Matrix view is not contiguous")
+
+        size = self.rows * self.cols
+        flat = self.buffer[self.offset:self.offset + size]
+
+        return flat.cast("B").cast("d", (self.rows, self.cols))
+
+    def __buffer__(self, flags):
+        return self.memoryview()
+
+    def __array__(self, dtype=None, copy=None):
+
+        # float64 ndarray over the same buffer, strides and all, so
+        # transposes and blocks convert without a copy too
+        import numpy as np
+
+        a = np.ndarray(
+            (self.rows, self.cols),
+            np.float64,
+            self.buffer,
+            self.offset * 8,
+            (self.row_stride * 8, self.col_stride * 8)
+        )
+
+        if dtype is not None and np.dtype(dtype) != a.dtype:
+            if copy is False:
+                raise ValueError("Converting to %s needs a copy" % np.dtype(dtype))
+
+            return a.astype(dtype)
+
+        return a.copy() if copy else a
+
+    def add(self, m):
+
+        if self.rows != m.rows or self.cols != m.cols:
+            raise ValueError("Matrices must have same dimensions")
+
+        if self.is_contiguous() and m.is_contiguous():
+            size = self.rows * self.cols
+            a = self.buffer[self.offset:self.offset + size]
+            b = m.buffer[m.offset:m.offset + size]
+
+            return StridedMatrix(array("d", map(operator.add, a, b)), self.rows, self.cols)
+
+        buf = array("d")
+
+        for i in range(self.rows):
+            buf.extend(map(operator.add, self.row_values(i), m.row_values(i)))
+
+        return StridedMatrix(buf, self.rows, self.cols)
+
+    def multiply(self, m):
+
+        if self.cols != m.rows:
+            raise ValueError("Invalid matrix multiplication")
+
+        cols = [m.col_values(j) for j in range(m.cols)]
+        buf = array("d")
+
+        for i in range(self.rows):
+            row = self.row_values(i)
+            buf.extend(sum(map(operator.mul, row, col)) for col in cols)
+
+        return StridedMatrix(buf, self.rows, m.cols)
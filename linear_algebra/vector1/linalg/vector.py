@@ -1,49 +1,68 @@
-import math
+import operator
+from numbers import Number
+
+from linalg.backend import get_backend
 
 
 class DimensionMismatchError(Exception):
     pass
 
 
+def _check_out(out):
+
+    # Results are written into out.data, so it must be a real list
+    if not isinstance(out, Vector):
+        raise TypeError("out must be a Vector, not %s" % type(out).__name__)
+
+
 class Vector:
 
+    # add, sub, scalar_multiply and cross take an optional `out` Vector
+    # of the result's dimension and write into its existing list (out may
+    # be self or the other operand).  +=, -= and *= do the same on self.
+    # dot and norm run on a compute backend (see linalg.backend).
+
     def __init__(self, data):
         self.data = data
         self.n = len(data)
 
-    def add(self, v):
+    def _into(self, values, out):
+
+        # A new Vector of `values`, or `values` written into out
+        if out is None:
+            return Vector(list(values))
+
+        _check_out(out)
+
+        if out.n != self.n:
+            raise DimensionMismatchError("Output vector must have dimension %d" % self.n)
+
+        out.data[:] = values
+
+        return out
+
+    def add(self, v, out=None):
         if self.n != v.n:
             raise DimensionMismatchError("Vectors must have same dimension")
 
-        return Vector([
-            self.data[i] + v.data[i]
-            for i in range(self.n)
-        ])
+        return self._into(map(operator.add, self.data, v.data), out)
 
-    def sub(self, v):
+    def sub(self, v, out=None):
         if self.n != v.n:
             raise DimensionMismatchError("Vectors must have same dimension")
 
-        return Vector([
-            self.data[i] - v.data[i]
-            for i in range(self.n)
-        ])
+        return self._into(map(operator.sub, self.data, v.data), out)
 
-    def scalar_multiply(self, scalar):
-        return Vector([
-            x * scalar for x in self.data
-        ])
+    def scalar_multiply(self, scalar, out=None):
+        return self._into([x * scalar for x in self.data], out)
 
-    def dot(self, v):
+    def dot(self, v, backend=None):
         if self.n != v.n:
             raise DimensionMismatchError("Vectors must have same dimension")
 
-        return sum(
-            self.data[i] * v.data[i]
-            for i in range(self.n)
-        )
+        return get_backend(backend, self.n, (self.data, v.data)).dot(self.data, v.data)
 
-    def cross(self, v):
+    def cross(self, v, out=None):
 
         if self.n != 3 or v.n != 3:
             raise ValueError("Cross product only defined for 3D vectors")
@@ -52,9 +71,53 @@ class Vector:
         y = self.data[2]*v.data[0] - self.data[0]*v.data[2]
         z = self.data[0]*v.data[1] - self.data[1]*v.data[0]
 
-        return Vector([x, y, z])
+        if out is None:
+            return Vector([x, y, z])
+
+        _check_out(out)
+
+        if out.n != 3:
+            raise DimensionMismatchError("Output vector must have dimension 3")
+
+        d = out.data
+        d[0] = x
+        d[1] = y
+        d[2] = z
+
+        return out
+
+    def norm(self, backend=None):
+        return get_backend(backend, self.n, (self.data,)).norm(self.data)
+
+    def lazy(self):
+
+        # Deferred expression; see linalg.lazy
+        from linalg.lazy import Leaf
+
+        return Leaf(self)
+
+    def __add__(self, v):
+        return self.add(v) if isinstance(v, Vector) else NotImplemented
+
+    def __sub__(self, v):
+        return self.sub(v) if isinstance(v, Vector) else NotImplemented
+
+    def __mul__(self, scalar):
+        return self.scalar_multiply(scalar) if isinstance(scalar, Number) else NotImplemented
+
+    __rmul__ = __mul__
+
+    def __matmul__(self, v):
+        return self.dot(v) if isinstance(v, Vector) else NotImplemented
+
+    def __iadd__(self, v):
+        return self.add(v, out=self) if isinstance(v, Vector) else NotImplemented
+
+    def __isub__(self, v):
+        return self.sub(v, out=self) if isinstance(v, Vector) else NotImplemented
+
+    def __imul__(self, scalar):
+        return self.scalar_multiply(scalar, out=self) if isinstance(scalar, Number) else NotImplemented
 
-    def norm(self):
-        return math.sqrt(
-            sum(x*x for x in self.data)
-        )
\ No newline at end of file
+    def __neg__(self):
+        return self.scalar_multiply(-1)